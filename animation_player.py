@@ -1,40 +1,419 @@
-from functools import lru_cache
-from typing import Dict, Any, Tuple, Union, Optional
-from dataclasses import asdict
+import os
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Tuple, Union, Optional, Sequence, List
 
-from parse_yaml import parse_anim
-from cache_yaml import load_yaml
+import numpy as np
+
+from parse_yaml import parse_anim, parse_anim_stream, parse_clip_settings
+from unity_yaml import UnityYAMLError
+from compiled_curve import (CompiledCurve, BakedCurve, simplify_curve, wrap_time, wrap_time_scalar,
+                            WRAP_CLAMP, WRAP_LOOP, WRAP_PINGPONG)
+from cache_yaml import load_yaml, _get_file_sha256, _get_file_stat
+from clip_events import EventIndex
+from clip_pose import PoseLayout, PoseEvaluator
+from quaternion import QuaternionTrack, convert_quaternion, normalize_quaternions, QUATERNION_COMPONENTS
+from clip_cache import load_compiled_clip, save_compiled_clip, pack_clip, unpack_clip
+
+from kwargs import PlayKwargsDict, type_kwargs
+
+# Playback wrap modes: 'once' reports times outside [0, stop_time] as not playable,
+# the others map them back into the clip; 'clip' picks the mode stored in the clip
+WRAP_MODES = ('once', 'clamp', 'loop', 'pingpong', 'clip')
+_WRAP_IDS = {'clamp': WRAP_CLAMP, 'loop': WRAP_LOOP, 'pingpong': WRAP_PINGPONG}
+
+# In-memory LRU of compiled clips shared by load_clip and preload_directory
+CLIP_CACHE_SIZE = 64
+_clip_cache: 'OrderedDict[str, Tuple[Dict[str, Any], float, Dict[str, Any]]]' = OrderedDict()
+
+
+def simplify_clip(anim: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace every curve of a parsed clip by its simplified form (see simplify_curve), in place.
+
+    Returns a report of the channel count, how many channels became static, and the
+    segments and bytes before and after.
+    """
+    report = {'channels': 0, 'static_channels': 0,
+              'segments_before': 0, 'segments_after': 0, 'bytes_before': 0, 'bytes_after': 0}
+
+    def simplify(curve):
+        simplified = simplify_curve(curve)
+        report['channels'] += 1
+        report['static_channels'] += simplified.is_static
+        report['segments_before'] += len(curve)
+        report['segments_after'] += len(simplified)
+        report['bytes_before'] += curve.nbytes
+        report['bytes_after'] += simplified.nbytes
+        return simplified
+
+    for kinds in anim.values():
+        for kind, comps in kinds.items():
+            if isinstance(comps, dict):
+                for comp, curve in comps.items():
+                    comps[comp] = simplify(curve)
+            elif isinstance(comps, CompiledCurve):
+                kinds[kind] = simplify(comps)
+    return report
+
+
+def _compile_clip(path: str, cache: bool = True) -> Tuple[Dict[str, Any], float, Dict[str, Any]]:
+    """Load a compiled clip, skipping YAML parsing and compilation when the binary cache is valid"""
+    if cache:
+        clip = load_compiled_clip(path)
+        if clip is not None:
+            return clip
+        # Signed before parsing, so an edit made while we parse leaves the cache stale
+        source_stat, source_sha256 = _get_file_stat(path), _get_file_sha256(path)
+    try:
+        anim, stop_time, settings = parse_anim_stream(path)
+    except UnityYAMLError as e:
+        print(f"[DEBUG]Streaming parser fell back to the full loader for {path}: {e}")
+        # The compiled cache supersedes the JSON intermediate, so don't write one
+        anim_json = load_yaml(path, cache=False)
+        anim, stop_time = parse_anim(anim_json)
+        settings = parse_clip_settings(anim_json)
+    report = simplify_clip(anim)
+    print(f"[DEBUG]Simplified {path}: {report['static_channels']}/{report['channels']} static channels, "
+          f"{report['segments_before'] - report['segments_after']} segments and "
+          f"{report['bytes_before'] - report['bytes_after']} bytes eliminated")
+    if cache:
+        save_compiled_clip(path, anim, stop_time, settings, source_sha256, source_stat)
+    return anim, stop_time, settings
+
+
+def _remember_clip(path: str, clip: Tuple[Dict[str, Any], float, Dict[str, Any]]):
+    _clip_cache[os.path.normpath(path)] = clip
+    _clip_cache.move_to_end(os.path.normpath(path))
+    while len(_clip_cache) > CLIP_CACHE_SIZE:
+        _clip_cache.popitem(last=False)
+
+
+def load_clip(path: str) -> Tuple[Dict[str, Any], float, Dict[str, Any]]:
+    """Return (anim, stop_time, settings), compiling the clip on first use"""
+    key = os.path.normpath(path)
+    clip = _clip_cache.get(key)
+    if clip is None:
+        clip = _compile_clip(path)
+    _remember_clip(path, clip)
+    return clip
+
+
+def clear_clip_cache():
+    """Drop every clip held in memory (disk caches are left alone)"""
+    _clip_cache.clear()
+
+
+def _preload_worker(path: str) -> Dict[str, Any]:
+    """Process-pool task: compile one clip and ship it back as packed arrays"""
+    start = time.perf_counter()
+    try:
+        arrays, header = pack_clip(*_compile_clip(path))
+        return {'path': path, 'ok': True, 'seconds': time.perf_counter() - start,
+                'error': None, 'packed': (arrays, header)}
+    except Exception:
+        return {'path': path, 'ok': False, 'seconds': time.perf_counter() - start,
+                'error': traceback.format_exc(), 'packed': None}
+
+
+def preload_directory(path: str, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Compile every .anim under path in parallel and put the results in the load_clip cache.
+
+    workers defaults to the CPU count; 1 compiles in-process. Returns one report per file
+    with 'path', 'ok', 'seconds' and 'error' (a traceback string); bad files don't stop the batch.
+    """
+    files = sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith('.anim'))
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(files) <= 1:
+        results = [_preload_worker(f) for f in files]
+    else:
+        results = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            futures = {pool.submit(_preload_worker, f): f for f in files}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception:
+                    # The worker itself died or the result could not be transferred
+                    results.append({'path': futures[future], 'ok': False, 'seconds': 0.0,
+                                    'error': traceback.format_exc(), 'packed': None})
+        results.sort(key=lambda r: r['path'])
+
+    reports = []
+    for result in results:
+        packed = result.pop('packed')
+        if packed is not None:
+            _remember_clip(result['path'], unpack_clip(*packed))
+        reports.append(result)
+    return reports
+
+def clip_wrap_mode(settings: Dict[str, Any]) -> str:
+    """The playback wrap mode a clip asks for through m_LoopTime / m_WrapMode"""
+    if settings.get('loop_time') or settings.get('wrap_mode') == 2:
+        return 'loop'
+    return {4: 'pingpong', 8: 'clamp'}.get(settings.get('wrap_mode'), 'once')
 
-from kwargs import PlayKwargs, PlayKwargsDict
 
-@lru_cache(maxsize=64)
 def load_anim(path: str) -> Tuple[Dict[str, Any], float]:
-    anim_json = load_yaml(path)
-    anim, stop_time = parse_anim(anim_json)
+    anim, stop_time, _ = load_clip(path)
     return anim, stop_time
 
-def type_kwargs(**kwargs) -> PlayKwargsDict:
 
-    default_kwargs = PlayKwargs()
-    merged_kwargs = {**asdict(default_kwargs), **kwargs}
-        
-    typed_kwargs: PlayKwargsDict = {
-        'path': str(merged_kwargs['path']),
-        'timeReverse': bool(merged_kwargs['timeReverse']),
-        'Eunit': merged_kwargs['Eunit'],
-        'Runit': merged_kwargs['Runit'],
-        'Punit': merged_kwargs['Punit'],
-        'Preverse': merged_kwargs['Preverse'],
-        'Pratio': merged_kwargs['Pratio']
-    }
-    return typed_kwargs
+class PlaybackHandle:
+    """play_frame for one path with options resolved once by AnimationPlayer.bind.
+
+    at(t) returns the same (dic, playable) as play_frame without any kwargs handling.
+    Every channel keeps a cursor on its last segment, so playing forward or backward
+    in small steps avoids a full search; give each consumer its own handle.
+    """
+    __slots__ = ('path', 'stop_time', 'time_reverse', 'wrap', '_outputs')
+
+    def __init__(self, player: 'AnimationPlayer', typed_kwargs: PlayKwargsDict):
+        self.path = typed_kwargs['path']
+        self.stop_time = player.stop_time
+        self.wrap = _WRAP_IDS.get(player.wrap_mode)  # None for 'once'
+        self.time_reverse = typed_kwargs['timeReverse']
+        if self.path not in player.anim:
+            raise KeyError(f"Path '{self.path}' not found, available: {list(player.anim)}")
+        ani = player.anim[self.path]
+
+        # (key, evaluators, factors, as_tuple) in play_frame's output order
+        outputs = []
+        if 'Euler' in ani:
+            outputs.append(self._resolve('euler', ani['Euler'], typed_kwargs['Eunit']))
+        if 'Rotation' in ani:
+            rformat = typed_kwargs['Rformat']
+            if rformat == 'components':
+                outputs.append(self._resolve('rotation', ani['Rotation'], typed_kwargs['Runit']))
+            else:
+                key, evaluators, factors, _ = self._resolve('rotation', ani['Rotation'], QUATERNION_COMPONENTS)
+                outputs.append((key, evaluators, factors, lambda *q: convert_quaternion(*q, rformat)))
+        if 'Position' in ani:
+            punit = typed_kwargs['Punit']
+            preverse = typed_kwargs['Preverse']
+            pratio = typed_kwargs['Pratio']
+            units = punit if isinstance(punit, tuple) else (punit,)
+            for option, value in (('Preverse', preverse), ('Pratio', pratio)):
+                if isinstance(value, tuple) and len(value) < len(units):
+                    raise ValueError(f"{option} has {len(value)} values but Punit has {len(units)}")
+            if isinstance(punit, tuple):
+                ratios = [pratio[i] if isinstance(pratio, tuple) else pratio for i in range(len(units))]
+                reverses = [preverse[i] if isinstance(preverse, tuple) else preverse for i in range(len(units))]
+            else:
+                ratios = [pratio if isinstance(pratio, (int, float)) else pratio[0]]
+                reverses = [preverse if isinstance(preverse, bool) else preverse[0]]
+            factors = tuple(-r if rev else r for r, rev in zip(ratios, reverses))
+            outputs.append(self._resolve('position', ani['Position'], punit, factors))
+        if 'Scale' in ani:
+            outputs.append(self._resolve('scale', ani['Scale'], ('x', 'y')))
+        if 'Float' in ani:
+            funit = typed_kwargs['Funit']
+            outputs.append(self._resolve('float', ani['Float'], tuple(ani['Float']) if funit is None else funit,
+                                         names=funit is None))
+        self._outputs = tuple(outputs)
+
+    @staticmethod
+    def _resolve(key, curves, units, factors=None, names=False):
+        """(key, evaluators, factors, form); form is False for a scalar, True for a tuple,
+        the unit names when the output is a dict, or a function of the values"""
+        as_tuple = isinstance(units, tuple)
+        units = units if as_tuple else (units,)
+        evaluators = []
+        for unit in units:
+            if unit not in curves:
+                raise KeyError(f"Component '{unit}' not animated for {key}, available: {list(curves)}")
+            curve = curves[unit]
+            evaluators.append(curve.cursor_evaluator() if curve else (lambda t: 0.0))
+        return key, tuple(evaluators), factors or (1,) * len(units), units if names else as_tuple
+
+    def at(self, t: float) -> Tuple[Dict[str, Any], bool]:
+        if t > self.stop_time or t < 0:
+            if self.wrap is None:
+                return {}, False
+            t = wrap_time_scalar(t, 0.0, self.stop_time, self.wrap)[0]
+        if self.time_reverse:
+            t = self.stop_time - t
+        dic = {}
+        for key, evaluators, factors, form in self._outputs:
+            if form is False:
+                dic[key] = evaluators[0](t) * factors[0]
+                continue
+            values = [evaluate(t) * factor for evaluate, factor in zip(evaluators, factors)]
+            if form is True:
+                dic[key] = tuple(values)
+            elif type(form) is tuple:
+                dic[key] = dict(zip(form, values))
+            else:
+                dic[key] = form(*values)
+        return dic, True
 
 
 class AnimationPlayer:
-    def __init__(self, path: str, stop_time: Optional[float] = None):
-        self.anim, self.stop_time = load_anim(path)
+    def __init__(self, path: str, stop_time: Optional[float] = None, wrap_mode: str = 'once'):
+        """wrap_mode is one of WRAP_MODES and decides what playing past either end of the clip does"""
+        self._set_clip(load_clip(path), stop_time, wrap_mode)
+
+    @classmethod
+    def from_clip(cls, clip: Tuple[Dict[str, Any], float, Dict[str, Any]],
+                  stop_time: Optional[float] = None, wrap_mode: str = 'once') -> 'AnimationPlayer':
+        """Create a player from an already loaded (anim, stop_time, settings) clip, e.g. ClipLibrary.open_clip"""
+        player = cls.__new__(cls)
+        player._set_clip(clip, stop_time, wrap_mode)
+        return player
+
+    def _set_clip(self, clip: Tuple[Dict[str, Any], float, Dict[str, Any]], stop_time: Optional[float],
+                  wrap_mode: str = 'once'):
+        self.anim, self.stop_time, self.settings = clip
         if stop_time is not None:
             self.stop_time = stop_time
+        self.baked: Optional[Dict[str, Any]] = None  # Bake report while baked mode is on
+        self._analytic_anim = self.anim
+        self._event_index: Optional[EventIndex] = None
+        # Path -> row and channel -> column of pose(), fixed for the clip
+        self.pose_layout = PoseLayout(self.anim)
+        self._pose_evaluator: Optional[PoseEvaluator] = None
+        self._rotation_tracks: Dict[str, QuaternionTrack] = {}
+        self.set_wrap_mode(wrap_mode)
+
+    @property
+    def events(self) -> EventIndex:
+        """The clip's m_Events, indexed by time"""
+        if self._event_index is None or self._event_index.stop_time != self.stop_time:
+            self._event_index = EventIndex(self.settings.get('events', []), self.stop_time)
+        return self._event_index
+
+    def events_between(self, prev_t: Optional[float], t: float, timeReverse: bool = False) -> List[Dict[str, Any]]:
+        """Events crossed between two consecutive frame times (prev_t None on the first frame).
+
+        Follows the player's wrap_mode, so looping and ping-pong playback fire events
+        every cycle; with timeReverse (or t < prev_t) they fire in reverse order.
+        """
+        return self.events.crossed(prev_t, t, self.wrap_mode, timeReverse)
+
+    def set_wrap_mode(self, wrap_mode: str):
+        """'once' (not playable outside the clip), 'clamp', 'loop', 'pingpong', or 'clip' for the clip's own setting"""
+        if wrap_mode not in WRAP_MODES:
+            raise ValueError(f"Unknown wrap mode '{wrap_mode}', expected one of {WRAP_MODES}")
+        self.wrap_mode = clip_wrap_mode(self.settings) if wrap_mode == 'clip' else wrap_mode
+
+    def _clip_time(self, t: float) -> Optional[float]:
+        """Map a playback time into [0, stop_time]; None once a 'once' clip is over"""
+        if 0 <= t <= self.stop_time:
+            return t
+        if self.wrap_mode == 'once':
+            return None
+        return wrap_time_scalar(t, 0.0, self.stop_time, _WRAP_IDS[self.wrap_mode])[0]
+
+    def _clip_times(self, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized _clip_time: (times in [0, stop_time], playable mask)"""
+        if self.wrap_mode == 'once':
+            return np.clip(times, 0, self.stop_time), (times >= 0) & (times <= self.stop_time)
+        return wrap_time(times, 0.0, self.stop_time, _WRAP_IDS[self.wrap_mode])[0], np.ones(times.shape, dtype=bool)
+
+    def bake(self, multiple: float = 1, interpolate: bool = True) -> Dict[str, Any]:
+        """Switch to baked mode: every curve is pre-sampled at (at least) m_SampleRate * multiple.
+
+        play_frame and sample then answer by table lookup (linearly interpolated
+        between samples unless interpolate is False). Returns a report with the
+        table size in bytes and the max abs error against the analytic curves.
+        Static channels are not sampled; they keep their constant curve.
+        """
+        anim = self._analytic_anim
+        rate = self.settings['sample_rate'] * multiple
+        n_samples = int(np.ceil(self.stop_time * rate)) + 1
+        # Stretch the grid so the last sample lands on stop_time, never past it into the post-infinity wrap
+        if n_samples > 1:
+            rate = (n_samples - 1) / self.stop_time
+        sample_times = np.linspace(0, self.stop_time, n_samples)
+
+        channels = [(path, kind, comp, curve)
+                    for path, kinds in anim.items()
+                    for kind, comps in kinds.items()
+                    for comp, curve in comps.items()]
+        # Filled in below; keyed up front so the component order matches the analytic clip
+        baked_anim: Dict[str, Any] = {path: {kind: dict.fromkeys(comps) for kind, comps in kinds.items()}
+                                      for path, kinds in anim.items()}
+        # Static channels stay analytic: a constant is cheaper than any table row
+        n_static = 0
+        for path, kind, comp, curve in channels:
+            if isinstance(curve, CompiledCurve) and curve.is_static:
+                baked_anim[path][kind][comp] = curve
+                n_static += 1
+        channels = [channel for channel in channels
+                    if not (isinstance(channel[3], CompiledCurve) and channel[3].is_static)]
+        # One contiguous table for the whole clip; each BakedCurve holds a row view
+        table = np.empty((len(channels), n_samples), dtype=np.float32)
+        # Check the error between samples as well as on them
+        check_times = np.linspace(0, self.stop_time, (n_samples - 1) * 16 + 1)
+        max_error = 0.0
+        for row, (path, kind, comp, curve) in enumerate(channels):
+            table[row] = self._sample_curves({comp: curve}, comp, sample_times)[:, 0]
+            baked = BakedCurve(table[row], 0.0, rate, interpolate)
+            baked_anim[path][kind][comp] = baked
+            if curve:
+                check = np.concatenate([check_times, curve.x[(curve.x >= 0) & (curve.x <= self.stop_time)]])
+                max_error = max(max_error, float(np.max(np.abs(baked.evaluate(check) - curve.evaluate(check)))))
+
+        self.anim = baked_anim
+        self._pose_evaluator = None
+        self._rotation_tracks = {}
+        self.baked = {
+            'sample_rate': rate,
+            'n_samples': n_samples,
+            'n_channels': len(channels),
+            'n_static': n_static,
+            'nbytes': table.nbytes,
+            'max_error': max_error,
+        }
+        return self.baked
+
+    def unbake(self):
+        """Return to evaluating the analytic curves"""
+        self.anim = self._analytic_anim
+        self.baked = None
+        self._pose_evaluator = None
+        self._rotation_tracks = {}
+
+    def rotation_track(self, path: str) -> QuaternionTrack:
+        """The m_RotationCurves of path as one 4-wide track (normalized, optionally converted to angles)"""
+        track = self._rotation_tracks.get(path)
+        if track is None:
+            track = self._rotation_tracks[path] = QuaternionTrack(self.anim[path]['Rotation'])
+        return track
+
+    def pose(self, times: Any, timeReverse: bool = False, normalize_rotations: bool = False) -> Tuple[np.ndarray, Any]:
+        """Every channel of every path at time t, or at each of an array of times.
+
+        Returns ``(pose, valid)``: ``pose`` is ``(n_paths, n_channels)`` for a scalar
+        time and ``(n_times, n_paths, n_channels)`` for an array, laid out by
+        ``self.pose_layout`` (NaN where a path has no such channel); ``valid`` is the
+        playable flag or mask, as in ``sample``. Values are the clip's own, without
+        the Punit/Pratio/Preverse options of play_frame. With normalize_rotations
+        every x/y/z/w Rotation is normalized, as Unity does after interpolating.
+        """
+        scalar = np.ndim(times) == 0
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        eval_times, valid = self._clip_times(times)
+        if timeReverse:
+            eval_times = self.stop_time - eval_times
+        if self._pose_evaluator is None:
+            self._pose_evaluator = PoseEvaluator(self.pose_layout, self.anim)
+        pose = self._pose_evaluator.evaluate(eval_times)
+        if normalize_rotations:
+            flat = pose.reshape(len(pose), -1)
+            quaternions = self.pose_layout.quaternion_slots()
+            flat[:, quaternions] = normalize_quaternions(flat[:, quaternions])
+        if scalar:
+            return pose[0], bool(valid[0])
+        return pose.reshape(times.shape + pose.shape[1:]), valid
+
+    def bind(self, **kwargs: Union[str, bool, Tuple, float]) -> PlaybackHandle:
+        """Validate play_frame kwargs once and return a handle whose at(t) skips option handling.
+
+        Rebind after bake()/unbake() or when the options change.
+        """
+        return PlaybackHandle(self, type_kwargs(**kwargs))
 
     def play_frame(self,
                    nowtime: float,
@@ -42,10 +421,10 @@ class AnimationPlayer:
         
         typed_kwargs = type_kwargs(**kwargs)
 
-        nowtime1 = nowtime
-        if typed_kwargs['timeReverse']:
-            nowtime = self.stop_time - nowtime
-        if nowtime1 <= self.stop_time and nowtime1 >= 0:
+        nowtime = self._clip_time(nowtime)
+        if nowtime is not None:
+            if typed_kwargs['timeReverse']:
+                nowtime = self.stop_time - nowtime
             dic: Dict[str, Any] = {}
             ani = self.anim[typed_kwargs['path']]
             if 'Euler' in ani:
@@ -60,9 +439,12 @@ class AnimationPlayer:
 
             if 'Rotation' in ani:
                 r = ani.get('Rotation')
-                # Handle Runit as single string or tuple
+                # Handle Runit as single string or tuple, or a normalized quaternion / angles by Rformat
                 runit = typed_kwargs['Runit']
-                if isinstance(runit, tuple):
+                if typed_kwargs['Rformat'] != 'components':
+                    q = [self._get_seg_result(r[unit], nowtime) for unit in QUATERNION_COMPONENTS]
+                    rotation = convert_quaternion(*q, typed_kwargs['Rformat'])
+                elif isinstance(runit, tuple):
                     rotation = tuple(self._get_seg_result(r[unit], nowtime) for unit in runit)
                 else:
                     rotation = self._get_seg_result(r[runit], nowtime)
@@ -101,32 +483,136 @@ class AnimationPlayer:
 
             if 'Float' in ani:
                 f = ani.get('Float')
-                if isinstance(f, list):
-                    float_val = self._get_seg_result(f, nowtime)
-                    dic['float'] = float_val
-            else:
-                float_val = 0.0
+                # Handle Funit as single attribute, tuple, or None for every attribute
+                funit = typed_kwargs['Funit']
+                if funit is None:
+                    dic['float'] = {attribute: self._get_seg_result(curve, nowtime) for attribute, curve in f.items()}
+                elif isinstance(funit, tuple):
+                    dic['float'] = tuple(self._get_seg_result(f[attribute], nowtime) for attribute in funit)
+                else:
+                    dic['float'] = self._get_seg_result(f[funit], nowtime)
             return dic, True
         else:
             return {}, False
 
-    def _get_seg_result(self, segments: Any, t: float) -> float:
-        """Binary search to find segmented interpolation result"""
+    def _get_seg_result(self, segments: Union[CompiledCurve, BakedCurve, None], t: float) -> float:
+        """Evaluate a compiled curve (searchsorted + Horner) or baked table at time t"""
         if not segments:
             return 0.0
+        return segments(t)
+
+    @staticmethod
+    def _sample_curves(curves: Dict[str, Union[CompiledCurve, BakedCurve]], units: Any, times: np.ndarray) -> np.ndarray:
+        """Evaluate one or more components over all times into an (n_times, n_components) array"""
+        units = units if isinstance(units, tuple) else (units,)
+        out = np.empty((len(times), len(units)), dtype=np.float64)
+        for i, unit in enumerate(units):
+            curve = curves[unit]
+            out[:, i] = curve.evaluate(times) if curve else 0.0
+        return out
+
+    def sample(self,
+               times: Any,
+               paths: Optional[Sequence[str]] = None,
+               channels: Optional[Sequence[str]] = None,
+               **kwargs: Union[str, bool, Tuple, float]) -> Tuple[Dict[str, Any], np.ndarray]:
+        """Vectorized play_frame over an array of times.
+
+        Returns ``(dic, valid)``: ``dic`` maps 'euler'/'rotation'/'position'/'scale'/'float'
+        to ``(n_times, n_components)`` arrays (float columns follow ``Funit``, or
+        ``self.anim[path]['Float']`` when it is None) and ``valid`` is the boolean mask of playable
+        times: with wrap_mode 'once' those inside ``[0, stop_time]`` (rows outside hold the
+        clamped end values), otherwise all of them, wrapped into the clip.
+        When ``paths`` is given, ``dic`` is keyed by path instead.
+        ``channels`` restricts which of the above keys are computed.
+        """
+        typed_kwargs = type_kwargs(**kwargs)
+
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        eval_times, valid = self._clip_times(times)
+        if typed_kwargs['timeReverse']:
+            eval_times = self.stop_time - eval_times
+
+        return self._sample_paths(paths, eval_times, channels, typed_kwargs), valid
+
+    def sample_instances(self,
+                         local_times: Any,
+                         speed: Any = None,
+                         reverse: Any = None,
+                         paths: Optional[Sequence[str]] = None,
+                         channels: Optional[Sequence[str]] = None,
+                         **kwargs: Union[str, bool, Tuple, float]) -> Tuple[Dict[str, Any], np.ndarray]:
+        """Evaluate the clip for many instances at once, e.g. a grid of staggered buttons.
+
+        ``local_times`` holds each instance's time since it started; ``speed`` (scalar or
+        per-instance) scales it and ``reverse`` (bool or per-instance) plays that instance
+        backwards, on top of ``timeReverse``. Returns ``(dic, valid)`` like ``sample``,
+        with one row per instance.
+        """
+        typed_kwargs = type_kwargs(**kwargs)
+
+        local_times = np.atleast_1d(np.asarray(local_times, dtype=np.float64))
+        times = local_times if speed is None else local_times * np.asarray(speed, dtype=np.float64)
+        eval_times, valid = self._clip_times(times)
+
+        flip = np.asarray(False if reverse is None else reverse, dtype=bool) ^ typed_kwargs['timeReverse']
+        if flip.ndim:
+            eval_times = np.where(flip, self.stop_time - eval_times, eval_times)
+        elif flip:
+            eval_times = self.stop_time - eval_times
+
+        return self._sample_paths(paths, eval_times, channels, typed_kwargs), valid
+
+    def _sample_paths(self,
+                      paths: Optional[Sequence[str]],
+                      times: np.ndarray,
+                      channels: Optional[Sequence[str]],
+                      typed_kwargs: PlayKwargsDict) -> Dict[str, Any]:
+        if paths is None:
+            return self._sample_path(typed_kwargs['path'], times, channels, typed_kwargs)
+        return {path: self._sample_path(path, times, channels, typed_kwargs) for path in paths}
 
-        left, right = 0, len(segments) - 1
-        while left <= right:
-            mid = (left + right) // 2
-            seg = segments[mid]
-            if t < seg.x[0]:
-                right = mid - 1
-            elif t > seg.x[-1]:
-                left = mid + 1
+    def _sample_path(self,
+                     path: str,
+                     times: np.ndarray,
+                     channels: Optional[Sequence[str]],
+                     typed_kwargs: PlayKwargsDict) -> Dict[str, np.ndarray]:
+        dic: Dict[str, np.ndarray] = {}
+        ani = self.anim[path]
+        wanted = lambda name: channels is None or name in channels
+
+        if 'Euler' in ani and wanted('euler'):
+            dic['euler'] = self._sample_curves(ani['Euler'], typed_kwargs['Eunit'], times)
+
+        if 'Rotation' in ani and wanted('rotation'):
+            if typed_kwargs['Rformat'] != 'components':
+                dic['rotation'] = self.rotation_track(path).evaluate(times, typed_kwargs['Rformat'])
+            else:
+                dic['rotation'] = self._sample_curves(ani['Rotation'], typed_kwargs['Runit'], times)
+
+        if 'Position' in ani and wanted('position'):
+            punit = typed_kwargs['Punit']
+            preverse = typed_kwargs['Preverse']
+            pratio = typed_kwargs['Pratio']
+            if isinstance(punit, tuple):
+                # Per-component ratio and sign, falling back to the scalar for every component
+                ratios = [pratio[i] if isinstance(pratio, tuple) else pratio for i in range(len(punit))]
+                reverses = [preverse[i] if isinstance(preverse, tuple) else preverse for i in range(len(punit))]
             else:
-                return seg(t)
+                ratios = [pratio if isinstance(pratio, (int, float)) else pratio[0]]
+                reverses = [preverse if isinstance(preverse, bool) else preverse[0]]
+            factors = np.array([-r if rev else r for r, rev in zip(ratios, reverses)], dtype=np.float64)
+            dic['position'] = self._sample_curves(ani['Position'], punit, times) * factors
+
+        if 'Scale' in ani and wanted('scale'):
+            dic['scale'] = self._sample_curves(ani['Scale'], ('x', 'y'), times)
+
+        if 'Float' in ani and wanted('float'):
+            # Funit=None gives every attribute, in the order of self.anim[path]['Float']
+            funit = typed_kwargs['Funit']
+            dic['float'] = self._sample_curves(ani['Float'], tuple(ani['Float']) if funit is None else funit, times)
 
-        return segments[-1](t)  # Boundary case
+        return dic
 
     def return_default(self,
                        default_value: float = 0.0,
@@ -141,7 +627,8 @@ class AnimationPlayer:
             dic['euler'] = tuple(default_value for _ in eunit) if isinstance(eunit, tuple) else default_value
 
         if 'Rotation' in ani:
-            runit = typed_kwargs['Runit']
+            runit = {'quaternion': QUATERNION_COMPONENTS, 'euler': ('x', 'y', 'z'), 'angle': 'z'}.get(
+                typed_kwargs['Rformat'], typed_kwargs['Runit'])
             dic['rotation'] = tuple(default_value for _ in runit) if isinstance(runit, tuple) else default_value
 
         if 'Position' in ani:
@@ -155,9 +642,13 @@ class AnimationPlayer:
             dic['scale'] = (default_value, default_value)
 
         if 'Float' in ani:
-            dic['float'] = default_value
-        else:
-            float_val = 0.0
+            funit = typed_kwargs['Funit']
+            if funit is None:
+                dic['float'] = {attribute: default_value for attribute in ani['Float']}
+            elif isinstance(funit, tuple):
+                dic['float'] = tuple(default_value for _ in funit)
+            else:
+                dic['float'] = default_value
 
         return dic, False
 
@@ -0,0 +1,113 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from animation_player import AnimationPlayer, PlaybackHandle
+
+
+@dataclass
+class FrameStats:
+    """Timing of an AsyncFrameDriver run; jitter is how late a tick woke up, in seconds"""
+    frames: int = 0
+    dropped: int = 0
+    jitter_mean: float = 0.0
+    jitter_max: float = 0.0
+    jitter_std: float = 0.0
+
+
+@dataclass
+class _Track:
+    handle: PlaybackHandle
+    speed: float
+    start: Optional[float] = None  # clock time of the track's first tick
+
+
+class AsyncFrameDriver:
+    """Evaluate players at a fixed rate from asyncio, e.g. for a headless preview or websocket overlay.
+
+    Tick k is due at start + k / rate on a monotonic clock, so the schedule never
+    drifts. A late tick is evaluated at the current time; ticks that were missed
+    entirely are dropped (and counted) instead of being played back to back.
+
+        driver = AsyncFrameDriver(60)
+        driver.add('popup', AnimationPlayer(path), path='general')
+        async for t, frames in driver.frames():
+            send(frames['popup'])
+    """
+
+    def __init__(self, rate: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.clock = clock
+        self.tracks: Dict[str, _Track] = {}
+        self._running = False
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._frames = 0
+        self._dropped = 0
+        self._jitter_sum = 0.0
+        self._jitter_sq_sum = 0.0
+        self._jitter_max = 0.0
+
+    @property
+    def stats(self) -> FrameStats:
+        n = self._frames
+        mean = self._jitter_sum / n if n else 0.0
+        variance = max(self._jitter_sq_sum / n - mean * mean, 0.0) if n else 0.0
+        return FrameStats(n, self._dropped, mean, self._jitter_max, math.sqrt(variance))
+
+    def add(self, name: str, player: AnimationPlayer, speed: float = 1.0,
+            **kwargs: Union[str, bool, Tuple, float]):
+        """Play player (with play_frame kwargs) under name, starting on the next tick"""
+        self.tracks[name] = _Track(player.bind(**kwargs), speed)
+
+    def remove(self, name: str):
+        self.tracks.pop(name, None)
+
+    def stop(self):
+        """End frames() after the current tick"""
+        self._running = False
+
+    def _tick(self, now: float) -> Dict[str, Tuple[Dict[str, Any], bool]]:
+        frames = {}
+        for name, track in list(self.tracks.items()):
+            if track.start is None:
+                track.start = now
+            frames[name] = track.handle.at((now - track.start) * track.speed)
+            if not frames[name][1]:
+                # Finished ('once' wrap mode): report it this tick, then drop the track
+                del self.tracks[name]
+        return frames
+
+    async def frames(self, until_idle: bool = True):
+        """Yield (elapsed, {name: (dic, playable)}) once per tick.
+
+        With until_idle the generator ends when every track has finished.
+        """
+        self._running = True
+        self._reset_stats()
+        start = self.clock()
+        tick = 0
+        while self._running and (self.tracks or not until_idle):
+            deadline = start + tick * self.period
+            delay = deadline - self.clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            now = self.clock()
+            late = now - deadline
+            if late >= self.period:
+                # Behind by whole ticks: skip them rather than catching up
+                missed = int(late // self.period)
+                self._dropped += missed
+                tick += missed
+                late -= missed * self.period
+            self._frames += 1
+            self._jitter_sum += late
+            self._jitter_sq_sum += late * late
+            self._jitter_max = max(self._jitter_max, late)
+            tick += 1
+            yield now - start, self._tick(now)
+        self._running = False
@@ -0,0 +1,346 @@
+import os
+import sys
+import time
+import json
+import argparse
+import platform
+import tempfile
+import contextlib
+import io
+import numpy as np
+
+from cache_yaml import clear_yaml_cache, load_yaml, yaml
+from unity_yaml import load_unity_yaml
+from parse_yaml import parse_anim, parse_anim_stream
+from clip_cache import iter_channels
+from compiled_curve import compile_hermite
+from animation_player import AnimationPlayer, load_anim, load_clip, clear_clip_cache, simplify_clip
+from synthetic_clip import CURVE_COMPONENTS, COMPRESSED_ROTATION_CURVES, write_clip
+
+ANIM_FOLDER = "examples/AnimationClip"
+
+
+def _timed_load(path):
+    """Load a clip with the in-memory cache cleared; returns seconds"""
+    clear_clip_cache()
+    # Silence the cache debug prints so they don't skew the timing
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        load_clip(path)
+        return time.perf_counter() - start
+
+
+def bench_load(folder=ANIM_FOLDER, repeat=5):
+    """Cold (no cache on disk) vs warm (compiled cache hit) load time for every clip"""
+    results = []
+    for name in sorted(f for f in os.listdir(folder) if f.endswith('.anim')):
+        path = os.path.join(folder, name)
+        cold = []
+        for _ in range(repeat):
+            with contextlib.redirect_stdout(io.StringIO()):
+                clear_yaml_cache(path)
+            cold.append(_timed_load(path))
+        warm = [_timed_load(path) for _ in range(repeat)]
+        results.append({'clip': name, 'cold': min(cold), 'warm': min(warm)})
+    return results
+
+
+def _best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_yaml(folder=ANIM_FOLDER, repeat=5):
+    """ruamel round-trip (+ JSON type stripping) vs the fast Unity loader, with an equality check"""
+    results = []
+    for name in sorted(f for f in os.listdir(folder) if f.endswith('.anim')):
+        with open(os.path.join(folder, name), 'r', encoding='utf-8') as f:
+            text = f.read()
+        ruamel_time, reference = _best_of(lambda: json.loads(json.dumps(yaml.load(text))), repeat)
+        fast_time, fast = _best_of(lambda: load_unity_yaml(text), repeat)
+        results.append({'clip': name, 'ruamel': ruamel_time, 'fast': fast_time, 'identical': fast == reference})
+    return results
+
+
+def bench_simplify(folder=ANIM_FOLDER):
+    """Static channels, segments and bytes removed by simplify_clip for every clip"""
+    results = []
+    for name in sorted(f for f in os.listdir(folder) if f.endswith('.anim')):
+        anim, _, _ = parse_anim_stream(os.path.join(folder, name))
+        results.append({'clip': name, **simplify_clip(anim)})
+    return results
+
+
+def _calls_per_second(func, duration=0.2):
+    """Call func(t) with advancing t for about duration seconds"""
+    calls = 0
+    t = 0.0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        for _ in range(1000):
+            func(t)
+            t = (t + 1 / 60) % 1.0
+        calls += 1000
+    return calls / (time.perf_counter() - start)
+
+
+def bench_play_frame(folder=ANIM_FOLDER):
+    """play_frame(t, **kwargs) vs a bound PlaybackHandle.at(t) on the first path of every clip"""
+    results = []
+    for name in sorted(f for f in os.listdir(folder) if f.endswith('.anim')):
+        with contextlib.redirect_stdout(io.StringIO()):
+            player = AnimationPlayer(os.path.join(folder, name))
+        path = next(iter(player.anim))
+        kwargs = {'path': path, 'Punit': ('x', 'y'), 'Pratio': (1, 0.5)}
+        handle = player.bind(**kwargs)
+        scale = player.stop_time
+        results.append({
+            'clip': name,
+            'play_frame': _calls_per_second(lambda t: player.play_frame(t * scale, **kwargs)),
+            'handle': _calls_per_second(lambda t: handle.at(t * scale)),
+        })
+    return results
+
+
+def bench_pose(folder=ANIM_FOLDER):
+    """Whole-clip poses per second: play_frame and bound handles once per path vs one pose(t)"""
+    results = []
+    for name in sorted(f for f in os.listdir(folder) if f.endswith('.anim')):
+        with contextlib.redirect_stdout(io.StringIO()):
+            player = AnimationPlayer(os.path.join(folder, name))
+        paths = list(player.anim)
+        handles = [player.bind(path=path) for path in paths]
+        scale = player.stop_time
+
+        def per_path(t):
+            for path in paths:
+                player.play_frame(t * scale, path=path)
+        results.append({
+            'clip': name,
+            'paths': len(paths),
+            'play_frame': _calls_per_second(per_path),
+            'handles': _calls_per_second(lambda t: [handle.at(t * scale) for handle in handles]),
+            'pose': _calls_per_second(lambda t: player.pose(t * scale)),
+        })
+    return results
+
+
+def bench_crowd(path=os.path.join(ANIM_FOLDER, 'UIAni_Button_Scale.anim'), counts=(10, 100, 1000, 10000), repeat=5):
+    """One handle.at call per instance vs a single sample_instances call, per frame"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        player = AnimationPlayer(path)
+    anim_path = next(iter(player.anim))
+    handle = player.bind(path=anim_path)
+    rng = np.random.default_rng(0)
+    results = []
+    for count in counts:
+        local_times = rng.uniform(0, player.stop_time, count)
+        speed = rng.uniform(0.5, 1.5, count)
+        reverse = rng.random(count) < 0.5
+
+        def per_instance():
+            # Same semantics as sample_instances, one Python call per instance
+            for t, s, r in zip(local_times.tolist(), speed.tolist(), reverse.tolist()):
+                t = min(max(t * s, 0.0), player.stop_time)
+                handle.at(player.stop_time - t if r else t)
+
+        loop_time, _ = _best_of(per_instance, repeat)
+        batch_time, _ = _best_of(lambda: player.sample_instances(local_times, speed, reverse, path=anim_path), repeat)
+        results.append({'instances': count, 'loop': loop_time, 'batch': batch_time})
+    return results
+
+
+def bench_cursor(folder=ANIM_FOLDER, repeat=5, synthetic_keys=100000):
+    """Per-channel lookup cost on the clip with the most segments (and one long synthetic
+    curve): searchsorted (play_frame), bisect (scalar_evaluator) and the playback cursor,
+    for 60 fps playback and random seeks"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        clips = {name: load_clip(os.path.join(folder, name))
+                 for name in sorted(f for f in os.listdir(folder) if f.endswith('.anim'))}
+    name, (anim, stop_time, _) = max(clips.items(), key=lambda item: sum(len(c) for *_, c in iter_channels(item[1][0])))
+    rng = np.random.default_rng(0)
+    # One key per 60 fps frame
+    keys = np.arange(synthetic_keys) / 60
+    synthetic = compile_hermite(keys, rng.normal(size=synthetic_keys), np.zeros(synthetic_keys), np.zeros(synthetic_keys))
+    cases = [(name, [c for *_, c in iter_channels(anim) if c and not c.is_static], stop_time),
+             (f"synthetic ({synthetic_keys} keys)", [synthetic], float(keys[-1]))]
+
+    results = []
+    for clip, curves, duration in cases:
+        patterns = {
+            'playback': np.arange(0, duration, 1 / 60).tolist(),
+            'seek': rng.uniform(0, duration, int(duration * 60) + 1).tolist(),
+        }
+        for pattern, times in patterns.items():
+            results.append(_bench_lookups(clip, pattern, curves, times, repeat))
+    return results
+
+
+def _bench_lookups(clip, pattern, curves, times, repeat):
+    row = {'clip': clip, 'pattern': pattern, 'segments': sum(len(c) for c in curves)}
+    for method, make in (('searchsorted', lambda c: c),
+                         ('bisect', lambda c: c.scalar_evaluator()),
+                         ('cursor', lambda c: c.cursor_evaluator())):
+        evaluators = [make(c) for c in curves]
+
+        def run():
+            for evaluate in evaluators:
+                for t in times:
+                    evaluate(t)
+        seconds, _ = _best_of(run, repeat)
+        row[method] = seconds / (len(times) * len(evaluators))
+    return row
+
+
+# ===== Regression suite: JSON results for every bundled clip plus synthetic large clips =====
+SUITE_VERSION = 3
+SYNTHETIC_KEYS = (1000, 10000)
+# Many paths with every transform curve type, some weighted keys and stepped slopes
+SYNTHETIC_MIXED = dict(n_paths=16, keys_per_curve=600, curve_types=tuple(CURVE_COMPONENTS),
+                       tangent_modes=(0, 1, 5, 136), weighted_fraction=0.1, infinite_fraction=0.02)
+# The same paths and keys with bit-packed rotations, to compare against the keyframe blocks
+SYNTHETIC_COMPRESSED = dict(n_paths=16, keys_per_curve=600,
+                            curve_types=(COMPRESSED_ROTATION_CURVES, 'm_PositionCurves', 'm_ScaleCurves'))
+
+
+def _seconds(func, repeat, setup=None):
+    """Best wall time of func over repeat runs, calling setup (untimed) before each"""
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_clip(path, repeat=5, frames=600, batch=100000):
+    """Load, parse, compile and evaluate timings (seconds) for one clip"""
+    def clear_all():
+        clear_yaml_cache(path)
+        clear_clip_cache()
+
+    result = {
+        'load_yaml_cold': _seconds(lambda: load_yaml(path), repeat, clear_all),
+        'load_yaml_warm': _seconds(lambda: load_yaml(path), repeat),
+    }
+    data = load_yaml(path)
+    result['parse_anim'] = _seconds(lambda: parse_anim(data), repeat)
+    result['load_anim_cold'] = _seconds(lambda: load_anim(path), repeat, clear_all)
+    load_anim(path)
+    result['load_anim_warm'] = _seconds(lambda: load_anim(path), repeat, clear_clip_cache)
+
+    player = AnimationPlayer(path)
+    paths = list(player.anim)
+    times = np.linspace(0, player.stop_time, frames).tolist()
+
+    def play_frames():
+        for t in times:
+            player.play_frame(t, path=paths[0])
+    result['play_frame'] = _seconds(play_frames, repeat) / frames
+    batch_times = np.linspace(0, player.stop_time, batch)
+    result['sample_per_second'] = batch / _seconds(lambda: player.sample(batch_times, paths=paths), repeat)
+    result['paths'] = len(paths)
+    result['segments'] = sum(len(c) for *_, c in iter_channels(player.anim) if c)
+    return result
+
+
+def run_suite(folder=ANIM_FOLDER, synthetic_keys=SYNTHETIC_KEYS, repeat=5):
+    """Benchmark every clip in folder plus synthetic clips; returns a JSON-able dict"""
+    results = {
+        'suite_version': SUITE_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'units': 'seconds; sample_per_second in samples/s',
+        'clips': {},
+    }
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in sorted(f for f in os.listdir(folder) if f.endswith('.anim')):
+            results['clips'][name] = bench_clip(os.path.join(folder, name), repeat)
+        with tempfile.TemporaryDirectory() as tmp:
+            # Caches of files outside the working tree land next to them, inside tmp
+            for n_keys in synthetic_keys:
+                path = os.path.join(tmp, f'synthetic_{n_keys}.anim')
+                write_clip(path, keys_per_curve=n_keys, name=f'synthetic_{n_keys}')
+                results['clips'][f'synthetic_{n_keys}'] = bench_clip(path, repeat)
+            path = write_clip(os.path.join(tmp, 'synthetic_mixed.anim'), name='synthetic_mixed', **SYNTHETIC_MIXED)
+            results['clips']['synthetic_mixed'] = bench_clip(path, repeat)
+            path = write_clip(os.path.join(tmp, 'synthetic_compressed.anim'), name='synthetic_compressed',
+                              **SYNTHETIC_COMPRESSED)
+            results['clips']['synthetic_compressed'] = bench_clip(path, repeat)
+    return results
+
+
+def main():
+    results = bench_load()
+    print(f"{'clip':<32}{'cold (ms)':>12}{'warm (ms)':>12}{'speedup':>10}")
+    for r in results:
+        print(f"{r['clip']:<32}{r['cold'] * 1000:>12.2f}{r['warm'] * 1000:>12.2f}{r['cold'] / r['warm']:>9.1f}x")
+
+    print()
+    results = bench_yaml()
+    print(f"{'clip':<32}{'ruamel (ms)':>12}{'fast (ms)':>12}{'speedup':>10}{'identical':>11}")
+    for r in results:
+        print(f"{r['clip']:<32}{r['ruamel'] * 1000:>12.2f}{r['fast'] * 1000:>12.2f}"
+              f"{r['ruamel'] / r['fast']:>9.1f}x{str(r['identical']):>11}")
+
+    print()
+    results = bench_simplify()
+    print(f"{'clip':<32}{'static':>10}{'segments':>12}{'bytes':>14}")
+    for r in results:
+        print(f"{r['clip']:<32}{r['static_channels']:>5}/{r['channels']:<4}"
+              f"{r['segments_before']:>5} -> {r['segments_after']:<3}{r['bytes_before']:>7} -> {r['bytes_after']:<5}")
+
+    print()
+    results = bench_play_frame()
+    print(f"{'clip':<32}{'play_frame/s':>14}{'handle/s':>12}{'speedup':>10}")
+    for r in results:
+        print(f"{r['clip']:<32}{r['play_frame']:>14.0f}{r['handle']:>12.0f}{r['handle'] / r['play_frame']:>9.1f}x")
+
+    print()
+    results = bench_pose()
+    print(f"{'clip':<32}{'paths':>6}{'play_frame/s':>14}{'handles/s':>12}{'pose/s':>10}{'speedup':>10}")
+    for r in results:
+        print(f"{r['clip']:<32}{r['paths']:>6}{r['play_frame']:>14.0f}{r['handles']:>12.0f}{r['pose']:>10.0f}"
+              f"{r['pose'] / r['play_frame']:>9.1f}x")
+
+    print()
+    results = bench_crowd()
+    print(f"{'instances':<32}{'loop (ms)':>12}{'batch (ms)':>12}{'speedup':>10}")
+    for r in results:
+        print(f"{r['instances']:<32}{r['loop'] * 1000:>12.3f}{r['batch'] * 1000:>12.3f}{r['loop'] / r['batch']:>9.1f}x")
+
+    print()
+    results = bench_cursor()
+    print(f"{'clip':<32}{'pattern':<10}{'searchsorted (us)':>18}{'bisect (us)':>13}{'cursor (us)':>13}")
+    for r in results:
+        print(f"{r['clip']:<32}{r['pattern']:<10}{r['searchsorted'] * 1e6:>18.3f}"
+              f"{r['bisect'] * 1e6:>13.3f}{r['cursor'] * 1e6:>13.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Unity2DAnimationPlayer benchmarks")
+    parser.add_argument('--json', nargs='?', const='-', metavar='FILE',
+                        help="run the regression suite and write JSON to FILE (stdout if omitted)")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per measurement (best is kept)")
+    parser.add_argument('--synthetic-keys', type=int, nargs='*', default=list(SYNTHETIC_KEYS),
+                        help="key counts of the synthetic clips")
+    args = parser.parse_args()
+    if args.json is None:
+        main()
+    else:
+        report = run_suite(synthetic_keys=args.synthetic_keys, repeat=args.repeat)
+        if args.json == '-':
+            json.dump(report, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
@@ -1,9 +1,13 @@
 import os
 import json
+import time
 import tempfile
 import hashlib
+import re
 from ruamel.yaml import YAML
 
+from unity_yaml import load_unity_yaml, UnityYAMLError, RAW_KEYS
+
 yaml = YAML()
 yaml.preserve_quotes = True
 yaml.constructor.ignore_aliases = True
@@ -22,25 +26,55 @@ temp_folder_path = os.path.join(tempfile.gettempdir(), 'DesktopLobby')
 os.makedirs(temp_folder_path, exist_ok=True)
 
 
+# Cache validation strategies:
+# 'stat'  - compare mtime + size + inode, fall back to SHA256 when they differ
+# 'hash'  - always compare the SHA256 of the source
+# 'trust' - accept any existing cache without looking at the source
+VALIDATION_STRATEGIES = ('stat', 'hash', 'trust')
+validation_strategy = 'stat'
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_cache_stats = {'hits': 0, 'misses': 0, 'hash_computations': 0, 'validation_time': 0.0}
+
+
+def set_validation_strategy(strategy: str):
+    """Select how cache files are checked against their source"""
+    global validation_strategy
+    if strategy not in VALIDATION_STRATEGIES:
+        raise ValueError(f"Unknown validation strategy '{strategy}', expected one of {VALIDATION_STRATEGIES}")
+    validation_strategy = strategy
+
+
 def _get_file_sha256(file_path):
     """Calculate the SHA256 hash of a file"""
     sha256_hash = hashlib.sha256()
     try:
         with open(file_path, "rb") as f:
-            # Read file in chunks to avoid memory issues with large files
-            for chunk in iter(lambda: f.read(4096), b""):
+            # Read file in large chunks to keep syscall overhead low without loading it whole
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
                 sha256_hash.update(chunk)
+        _cache_stats['hash_computations'] += 1
         return sha256_hash.hexdigest()
     except FileNotFoundError:
         return None
 
 
-def _save_cache_metadata(json_path, sha256_hash):
-    """Save cache metadata (SHA256 hash)"""
+def _get_file_stat(file_path):
+    """Cheap change signature of a file: [mtime_ns, size, inode]"""
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _save_cache_metadata(json_path, sha256_hash, source_stat=None):
+    """Save cache metadata (SHA256 hash and stat signature)"""
     metadata_path = json_path + '.metadata'
     try:
         with open(metadata_path, 'w') as f:
-            json.dump({'sha256': sha256_hash}, f)
+            json.dump({'sha256': sha256_hash, 'stat': source_stat}, f)
     except Exception as e:
         print(f"[Warning]Failed to save cache metadata: {e}")
 
@@ -55,27 +89,63 @@ def _load_cache_metadata(json_path):
         return None
 
 
-def load_yaml(path: str, cache=True):
-    """Load and cache yaml, using SHA256 to verify file consistency"""
+def _validate_cache(path, cache_path, strategy=None, refresh=True):
+    """Check cache_path against its source file with the given (or configured) strategy.
+
+    Returns (is_valid, source_sha256, source_stat); source_sha256 is None when it was not needed.
+    With refresh, a stale stat signature on unchanged content is rewritten in the metadata.
+    """
+    strategy = strategy or validation_strategy
+    start = time.perf_counter()
+    try:
+        source_stat = _get_file_stat(path)
+        if source_stat is None:
+            raise FileNotFoundError(f"Source file not found: {path}")
+        metadata = _load_cache_metadata(cache_path)
+        if not metadata or not os.path.exists(cache_path):
+            return False, None, source_stat
+        if strategy == 'trust':
+            return True, metadata.get('sha256'), source_stat
+        if strategy == 'stat' and metadata.get('stat') == source_stat:
+            return True, metadata.get('sha256'), source_stat
+
+        source_sha256 = _get_file_sha256(path)
+        is_valid = metadata.get('sha256') == source_sha256
+        if refresh and is_valid and metadata.get('stat') != source_stat:
+            # Content unchanged (e.g. touched or copied); refresh so the next check is a stat hit
+            _save_cache_metadata(cache_path, source_sha256, source_stat)
+        return is_valid, source_sha256, source_stat
+    finally:
+        _cache_stats['validation_time'] += time.perf_counter() - start
+
+
+# Plain scalars of RAW_KEYS, quoted before ruamel sees them so hex like 0001e400 stays text
+_RAW_KEY_RE = re.compile(r"^( *(?:- )?(?:%s): )([^'\"\s][^\s]*) *$" % '|'.join(map(re.escape, RAW_KEYS)), re.M)
+
+
+def parse_yaml_text(text: str, path: str = '<string>'):
+    """Parse Unity YAML with the fast loader, falling back to ruamel for unusual documents"""
+    try:
+        return load_unity_yaml(text)
+    except UnityYAMLError as e:
+        print(f"[DEBUG]Fast loader fell back to ruamel for {path}: {e}")
+        # Round-trip through JSON to strip ruamel's CommentedMap/Scalar types
+        return json.loads(json.dumps(yaml.load(_RAW_KEY_RE.sub(r"\1'\2'", text))))
+
+
+def load_yaml(path: str, cache=True, strategy=None):
+    """Load and cache yaml, validating the cache with the configured strategy (see VALIDATION_STRATEGIES)"""
     # Build cache json path
     json_path = os.path.join(temp_folder_path, path.rsplit('.', 1)[0] + '.json')
 
-    # Calculate SHA256 of source file
-    source_sha256 = _get_file_sha256(path)
-    if source_sha256 is None:
-        raise FileNotFoundError(f"Source file not found: {path}")
+    is_valid, source_sha256, source_stat = _validate_cache(path, json_path, strategy)
 
     try:
-        # Check if cache exists and is valid
-        metadata = _load_cache_metadata(json_path)
-
-        if (metadata and
-                metadata.get('sha256') == source_sha256 and
-                os.path.exists(json_path)):
-
+        if is_valid:
             # Cache is valid, read directly
             with open(json_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
+            _cache_stats['hits'] += 1
             print(f"[DEBUG]Loaded cached data for: {path}")
             return data
         else:
@@ -85,8 +155,9 @@ def load_yaml(path: str, cache=True):
 
     except (FileNotFoundError, json.JSONDecodeError):
         # Cache file doesn't exist or is corrupted, regenerate
+        _cache_stats['misses'] += 1
         with open(path, 'r', encoding='utf-8') as y:
-            data = yaml.load(y)
+            data = parse_yaml_text(y.read(), path)
 
         if cache:
             # Ensure directory exists
@@ -97,11 +168,11 @@ def load_yaml(path: str, cache=True):
                 json_data = json.dumps(data, ensure_ascii=False, indent=2)
                 j.write(json_data)
 
-            # Save metadata (SHA256)
-            _save_cache_metadata(json_path, source_sha256)
+            # Save metadata (SHA256 + stat signature)
+            _save_cache_metadata(json_path, source_sha256 or _get_file_sha256(path), source_stat)
             print(f"[DEBUG]Cached data regenerated for: {path}")
 
-        return json.loads(json.dumps(data))
+        return data
 
 
 def clear_yaml_cache(path: str = None):
@@ -110,8 +181,10 @@ def clear_yaml_cache(path: str = None):
         # Clear cache for specific file
         json_path = os.path.join(temp_folder_path, path.rsplit('.', 1)[0] + '.json')
         metadata_path = json_path + '.metadata'
+        # Compiled clip cache written by clip_cache
+        compiled_path = os.path.join(temp_folder_path, path.rsplit('.', 1)[0] + '.clip.npz')
 
-        for cache_path in [json_path, metadata_path]:
+        for cache_path in [json_path, metadata_path, compiled_path, compiled_path + '.metadata']:
             try:
                 if os.path.exists(cache_path):
                     os.remove(cache_path)
@@ -130,21 +203,38 @@ def clear_yaml_cache(path: str = None):
             print(f"[ERROR]Error clearing cache: {e}")
 
 
-def get_cache_info(path: str):
-    """Get cache information"""
+def get_cache_info(path: str, strategy=None):
+    """Get cache information, including the process-wide hit/miss/validation counters.
+
+    Only reads: the source is hashed only if the strategy itself needs it, and no
+    metadata is rewritten.
+    """
     json_path = os.path.join(temp_folder_path, path.rsplit('.', 1)[0] + '.json')
     metadata = _load_cache_metadata(json_path)
-    source_sha256 = _get_file_sha256(path)
+    source_stat = _get_file_stat(path)
 
     cache_exists = os.path.exists(json_path)
     metadata_exists = metadata is not None
-    is_valid = metadata and metadata.get('sha256') == source_sha256
+    # Compiled clip cache written by clip_cache
+    compiled_path = os.path.join(temp_folder_path, path.rsplit('.', 1)[0] + '.clip.npz')
+    is_valid = compiled_is_valid = False
+    source_sha256 = None
+    if source_stat is not None:
+        is_valid, source_sha256, _ = _validate_cache(path, json_path, strategy, refresh=False)
+        compiled_is_valid, compiled_sha256, _ = _validate_cache(path, compiled_path, strategy, refresh=False)
+        source_sha256 = source_sha256 or compiled_sha256
 
     return {
         'source_sha256': source_sha256,
         'cached_sha256': metadata.get('sha256') if metadata else None,
+        'source_stat': source_stat,
+        'cached_stat': metadata.get('stat') if metadata else None,
         'cache_exists': cache_exists,
         'metadata_exists': metadata_exists,
         'is_valid': is_valid,
-        'json_path': json_path
-    }
\ No newline at end of file
+        'json_path': json_path,
+        'compiled_path': compiled_path,
+        'compiled_is_valid': compiled_is_valid,
+        'validation_strategy': strategy or validation_strategy,
+        'stats': dict(_cache_stats),
+    }
@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from animation_player import AnimationPlayer
+from clip_pose import CurveBank, PoseLayout
+from quaternion import conjugate_quaternions, multiply_quaternions, normalize_quaternions, quaternion_powers
+
+# How a layer combines with the layers below it
+BLEND_OVERRIDE = 'override'  # weighted average with the other override layers
+BLEND_ADDITIVE = 'additive'  # adds weight * (value - value at the layer's clip time 0); rotations compose
+BLEND_MODES = (BLEND_OVERRIDE, BLEND_ADDITIVE)
+
+
+@dataclass
+class BlendLayer:
+    player: AnimationPlayer
+    weight: float = 1.0
+    offset: float = 0.0  # blend time at which the layer's clip starts
+    mode: str = BLEND_OVERRIDE
+
+
+class BlendNode:
+    """Blend several clips into one pose per evaluation, e.g. a crossfade between two UI states.
+
+    Every curve of every layer lives in one CurveBank, so evaluating the blend is one
+    NumPy pass however many layers it has. Override layers are averaged by weight
+    (weights are relative; a layer that does not animate a channel leaves it to the
+    others), then additive layers add their weighted change from their first frame.
+    Override rotations are blended per component and renormalized (nlerp); an
+    additive rotation is applied as its change q * conj(q_first) raised to the
+    layer weight, multiplied onto the pose's rotation in layer order.
+    Layers are played through their player, so each follows its own wrap_mode; a
+    'once' layer outside its clip contributes nothing.
+
+        node = BlendNode()
+        node.add('UIAni_Scale_Select.anim', weight=1.0)
+        node.add('UIAni_Button_Scale.anim', weight=0.0)
+        pose, valid = node.evaluate(t, weights=(1 - a, a))
+    """
+
+    def __init__(self):
+        self.layers: List[BlendLayer] = []
+        self._anims: Optional[List[Dict[str, Any]]] = None  # layer anims the bank was built from
+
+    def add(self, clip: Union[AnimationPlayer, str, Tuple[Dict[str, Any], float, Dict[str, Any]]],
+            weight: float = 1.0, offset: float = 0.0, mode: str = BLEND_OVERRIDE) -> int:
+        """Add a layer from a player, an .anim path or a loaded clip; returns its index"""
+        if mode not in BLEND_MODES:
+            raise ValueError(f"Unknown blend mode '{mode}', expected one of {BLEND_MODES}")
+        if isinstance(clip, str):
+            clip = AnimationPlayer(clip)
+        elif not isinstance(clip, AnimationPlayer):
+            clip = AnimationPlayer.from_clip(clip)
+        self.layers.append(BlendLayer(clip, weight, offset, mode))
+        self._anims = None
+        return len(self.layers) - 1
+
+    def set_weight(self, layer: int, weight: float):
+        self.layers[layer].weight = weight
+
+    @property
+    def layout(self) -> PoseLayout:
+        """Union of the layers' paths and channels"""
+        self._build()
+        return self._layout
+
+    def _build(self):
+        """Pack every layer's curves into one bank; redone when a layer changes its curves (bake/unbake)"""
+        if self._anims is not None and all(a is l.player.anim for a, l in zip(self._anims, self.layers)):
+            return
+        self._anims = [layer.player.anim for layer in self.layers]
+        skeleton: Dict[str, Dict[str, Any]] = {}
+        for anim in self._anims:
+            for path, kinds in anim.items():
+                for kind, comps in kinds.items():
+                    if isinstance(comps, dict):
+                        skeleton.setdefault(path, {}).setdefault(kind, {}).update(dict.fromkeys(comps))
+                    else:
+                        skeleton.setdefault(path, {})[kind] = None
+        self._layout = layout = PoseLayout(skeleton)
+
+        curves, layer_of, slot_of = [], [], []
+        for i, anim in enumerate(self._anims):
+            for row, column, curve in layout.slots(anim):
+                curves.append(curve)
+                layer_of.append(i)
+                slot_of.append(row * layout.shape[1] + column)
+        self._bank = CurveBank(curves)
+        self._layer_of = np.array(layer_of, dtype=np.intp)
+        slot_of = np.array(slot_of, dtype=np.intp)
+
+        # Additive layers blend their change from the value at clip time 0
+        self._reference = self._bank.evaluate(np.zeros((1, len(curves))))[0]
+        additive = np.array([self.layers[i].mode == BLEND_ADDITIVE for i in layer_of], dtype=bool)
+        self._quaternions = layout.quaternion_slots()
+
+        # Additive rotations with all four components compose as quaternions instead of adding
+        curve_at = {(layer_of[c], slot_of[c]): c for c in np.nonzero(additive)[0]}
+        composed = np.zeros(len(curves), dtype=bool)
+        self._rotation_layers = []  # (layer, (m, 4) curve indices, (m, 4) slots) in layer order
+        for i, layer in enumerate(self.layers):
+            if layer.mode != BLEND_ADDITIVE:
+                continue
+            rows = [([curve_at.get((i, slot)) for slot in quad], quad) for quad in self._quaternions]
+            rows = [(found, quad) for found, quad in rows if None not in found]
+            if rows:
+                layer_curves = np.array([found for found, _ in rows], dtype=np.intp)
+                composed[layer_curves.reshape(-1)] = True
+                self._rotation_layers.append((i, layer_curves, np.array([quad for _, quad in rows], dtype=np.intp)))
+
+        self._groups = {}
+        for mode, members in ((BLEND_OVERRIDE, ~additive), (BLEND_ADDITIVE, additive & ~composed)):
+            # Curves sorted by slot, so np.add.reduceat sums each slot's contributions
+            order = np.nonzero(members)[0]
+            order = order[np.argsort(slot_of[order], kind='stable')]
+            slots, starts = np.unique(slot_of[order], return_index=True)
+            self._groups[mode] = (order, starts, slots)
+
+    def evaluate(self, times: Any, weights: Any = None) -> Tuple[np.ndarray, Any]:
+        """Blended pose at a time or an array of times, laid out by self.layout.
+
+        weights overrides the layers' weights: one per layer, or an (n_times, n_layers)
+        array to blend along the times. Returns ``(pose, valid)`` like
+        AnimationPlayer.pose, with NaN where no override layer animates a channel;
+        ``valid`` is False where no layer is playable.
+        """
+        self._build()
+        scalar = np.ndim(times) == 0
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64)).reshape(-1)
+        n, n_slots = len(times), self._layout.shape[0] * self._layout.shape[1]
+
+        layer_times = np.empty((n, len(self.layers)))
+        layer_valid = np.empty((n, len(self.layers)), dtype=bool)
+        for i, layer in enumerate(self.layers):
+            layer_times[:, i], layer_valid[:, i] = layer.player._clip_times(times - layer.offset)
+        w = np.asarray([l.weight for l in self.layers] if weights is None else weights, dtype=np.float64)
+        w = np.broadcast_to(w, layer_valid.shape) * layer_valid
+
+        values = self._bank.evaluate(layer_times[:, self._layer_of])
+        curve_w = w[:, self._layer_of]
+        pose = np.full((n, n_slots), np.nan)
+
+        order, starts, slots = self._groups[BLEND_OVERRIDE]
+        if len(order):
+            total = np.add.reduceat(curve_w[:, order], starts, axis=1)
+            mixed = np.add.reduceat((values * curve_w)[:, order], starts, axis=1)
+            pose[:, slots] = np.divide(mixed, total, out=np.full(mixed.shape, np.nan), where=total > 0)
+        order, starts, slots = self._groups[BLEND_ADDITIVE]
+        if len(order):
+            pose[:, slots] += np.add.reduceat(((values - self._reference) * curve_w)[:, order], starts, axis=1)
+        if len(self._quaternions):
+            pose[:, self._quaternions] = normalize_quaternions(pose[:, self._quaternions])
+        for i, layer_curves, slots in self._rotation_layers:
+            delta = multiply_quaternions(normalize_quaternions(values[:, layer_curves]),
+                                         conjugate_quaternions(normalize_quaternions(self._reference[layer_curves])))
+            delta = quaternion_powers(delta, w[:, i, None])
+            pose[:, slots] = normalize_quaternions(multiply_quaternions(delta, pose[:, slots]))
+
+        pose = pose.reshape((n,) + self._layout.shape)
+        valid = layer_valid.any(axis=1)
+        if scalar:
+            return pose[0], bool(valid[0])
+        return pose, valid
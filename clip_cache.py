@@ -0,0 +1,108 @@
+import os
+import json
+import zipfile
+import numpy as np
+
+from compiled_curve import CompiledCurve
+from cache_yaml import (temp_folder_path, _cache_stats, _get_file_sha256,
+                        _save_cache_metadata, _validate_cache)
+
+# Bump whenever the packed layout changes; older files are regenerated
+COMPILED_CACHE_VERSION = 7
+
+
+def _compiled_cache_path(path: str) -> str:
+    return os.path.join(temp_folder_path, path.rsplit('.', 1)[0] + '.clip.npz')
+
+
+def iter_channels(anim):
+    """Yield (path, kind, comp, curve) for every curve of a parsed clip; comp is '' for scalar curves"""
+    for path, kinds in anim.items():
+        for kind, comps in kinds.items():
+            if isinstance(comps, dict):
+                for comp, curve in comps.items():
+                    yield path, kind, comp, curve
+            else:
+                yield path, kind, '', comps
+
+
+def pack_clip(anim, stop_time, settings):
+    """Flatten a parsed clip into a dict of contiguous arrays plus a JSON-able header"""
+    channels = list(iter_channels(anim))
+    curves = [curve for *_, curve in channels]
+    x_offsets = np.zeros(len(curves) + 1, dtype=np.int64)
+    seg_offsets = np.zeros(len(curves) + 1, dtype=np.int64)
+    x_offsets[1:] = np.cumsum([len(c.x) for c in curves])
+    seg_offsets[1:] = np.cumsum([len(c) for c in curves])
+    arrays = {
+        'x': np.concatenate([c.x for c in curves]) if curves else np.zeros(0),
+        'coeffs': np.concatenate([c.coeffs for c in curves]) if curves else np.zeros((0, 4)),
+        'flags': np.concatenate([c.flags for c in curves]) if curves else np.zeros(0, dtype=np.uint8),
+        'wraps': np.array([(c.pre_wrap, c.post_wrap) for c in curves], dtype=np.uint8).reshape(-1, 2),
+        'x_offsets': x_offsets,
+        'seg_offsets': seg_offsets,
+    }
+    header = {
+        'stop_time': stop_time,
+        'settings': settings,
+        'channels': [[path, kind, comp] for path, kind, comp, _ in channels],
+    }
+    return arrays, header
+
+
+def unpack_clip(arrays, header):
+    """Rebuild the parsed clip; every CompiledCurve is a view into the packed arrays"""
+    x, coeffs, flags = arrays['x'], arrays['coeffs'], arrays['flags']
+    x_offsets, seg_offsets = arrays['x_offsets'], arrays['seg_offsets']
+    wraps = arrays['wraps'].tolist()
+    anim = {}
+    for i, (path, kind, comp) in enumerate(header['channels']):
+        curve = CompiledCurve(x[x_offsets[i]:x_offsets[i + 1]],
+                              coeffs[seg_offsets[i]:seg_offsets[i + 1]],
+                              flags[seg_offsets[i]:seg_offsets[i + 1]],
+                              *wraps[i])
+        kinds = anim.setdefault(path, {})
+        if comp:
+            kinds.setdefault(kind, {})[comp] = curve
+        else:
+            kinds[kind] = curve
+    return anim, header['stop_time'], header['settings']
+
+
+def save_compiled_clip(path: str, anim, stop_time, settings, source_sha256=None, source_stat=None):
+    """Write the compiled clip to the temp folder as a versioned .npz with a metadata sidecar"""
+    cache_path = _compiled_cache_path(path)
+    arrays, header = pack_clip(anim, stop_time, settings)
+    header['version'] = COMPILED_CACHE_VERSION
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            np.savez(f, header=np.array(json.dumps(header)), **arrays)
+        _save_cache_metadata(cache_path, source_sha256 or _get_file_sha256(path), source_stat)
+        print(f"[DEBUG]Compiled cache written for: {path}")
+    except Exception as e:
+        print(f"[Warning]Failed to save compiled cache: {e}")
+
+
+def load_compiled_clip(path: str, strategy=None):
+    """Return (anim, stop_time, settings) from the compiled cache, or None if it is missing or stale"""
+    cache_path = _compiled_cache_path(path)
+    is_valid, _, _ = _validate_cache(path, cache_path, strategy)
+    if not is_valid:
+        _cache_stats['misses'] += 1
+        return None
+    try:
+        with np.load(cache_path, allow_pickle=False) as npz:
+            header = json.loads(str(npz['header']))
+            if header.get('version') != COMPILED_CACHE_VERSION:
+                print(f"[WARNING]Compiled cache version outdated, regenerating for: {path}")
+                _cache_stats['misses'] += 1
+                return None
+            arrays = {key: npz[key] for key in npz.files if key != 'header'}
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        print(f"[WARNING]Compiled cache unreadable ({e}), regenerating for: {path}")
+        _cache_stats['misses'] += 1
+        return None
+    _cache_stats['hits'] += 1
+    print(f"[DEBUG]Loaded compiled cache for: {path}")
+    return unpack_clip(arrays, header)
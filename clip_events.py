@@ -0,0 +1,77 @@
+import math
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional
+
+
+class EventIndex:
+    """A clip's AnimationEvents sorted by time, answering "which events did playback cross".
+
+    crossed() bisects the precomputed time list once per clip cycle it spans, so a
+    per-frame check costs O(log n + k) for k returned events.
+    """
+
+    def __init__(self, events: List[Dict[str, Any]], stop_time: float):
+        self.events = sorted(events, key=lambda e: e['time'])
+        self.times = [e['time'] for e in self.events]
+        self.stop_time = stop_time
+
+    def __len__(self):
+        return len(self.events)
+
+    def _range(self, start: float, end: float, include_start: bool) -> List[Dict[str, Any]]:
+        """Events passed when clip time moves from start to end, in the order they are passed"""
+        times = self.times
+        if start <= end:
+            i = bisect_left(times, start) if include_start else bisect_right(times, start)
+            return self.events[i:bisect_right(times, end)]
+        i = bisect_left(times, end)
+        j = bisect_right(times, start) if include_start else bisect_left(times, start)
+        return self.events[i:j][::-1]
+
+    def crossed(self, prev_t: Optional[float], t: float, wrap_mode: str = 'once',
+                time_reverse: bool = False) -> List[Dict[str, Any]]:
+        """Events crossed when playback time moves from prev_t to t, in firing order.
+
+        Times are playback times as passed to play_frame; wrap_mode is the player's
+        ('once'/'clamp' stop at the ends, 'loop'/'pingpong' keep cycling) and with
+        time_reverse the clip plays backwards. Events at prev_t itself are not
+        included (they fired on the previous frame) unless prev_t is None.
+        """
+        length = self.stop_time
+        if not self.events:
+            return []
+        if prev_t is None:
+            prev_t, include_first = t, True
+        else:
+            include_first = False
+
+        if wrap_mode in ('loop', 'pingpong') and length > 0:
+            forward = t >= prev_t
+            if forward:
+                k0, k1 = math.floor(prev_t / length), math.floor(t / length)
+            else:
+                # A time on a cycle boundary belongs to the cycle that ends there
+                k0, k1 = math.ceil(prev_t / length) - 1, math.ceil(t / length) - 1
+            step = 1 if forward else -1
+            spans = []
+            for k in range(k0, k1 + step, step):
+                base = k * length
+                a = prev_t - base if k == k0 else (0.0 if forward else length)
+                b = t - base if k == k1 else (length if forward else 0.0)
+                if wrap_mode == 'pingpong' and k % 2:
+                    a, b = length - a, length - b
+                # A new loop cycle restarts at the other end of the clip; a ping-pong
+                # cycle turns around on the key it just reached
+                spans.append((a, b, include_first or (k != k0 and wrap_mode == 'loop')))
+        else:
+            clamp = lambda x: min(max(x, 0.0), length)
+            spans = [(clamp(prev_t), clamp(t), include_first)]
+
+        events = []
+        for a, b, include_start in spans:
+            if time_reverse:
+                a, b = length - a, length - b
+            if a == b and not include_start:
+                continue
+            events.extend(self._range(a, b, include_start))
+        return events
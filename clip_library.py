@@ -0,0 +1,143 @@
+import os
+import json
+import struct
+import numpy as np
+
+from compiled_curve import CompiledCurve
+from clip_cache import pack_clip
+
+# File layout: MAGIC | uint32 version | uint64 index length | JSON index | padding | raw arrays
+# Every raw array starts on a 64-byte boundary
+LIBRARY_MAGIC = b'U2DCLIB\0'
+LIBRARY_VERSION = 2
+_PREFIX = struct.Struct('<8sIQ')
+_ALIGN = 64
+
+_ARRAY_DTYPES = {
+    'x': np.float64,
+    'coeffs': np.float64,
+    'flags': np.uint8,
+}
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def build_clip_library(library_path: str, anim_paths, names=None):
+    """Compile .anim files and write them into one memory-mappable library file.
+
+    Clips are named after their file stem unless names are given. Returns the index.
+    """
+    from animation_player import load_clip
+
+    names = names or [os.path.splitext(os.path.basename(p))[0] for p in anim_paths]
+    chunks = {key: [] for key in _ARRAY_DTYPES}
+    totals = {'x': 0, 'seg': 0}
+    clips = {}
+    for name, anim_path in zip(names, anim_paths):
+        anim, stop_time, settings = load_clip(anim_path)
+        arrays, header = pack_clip(anim, stop_time, settings)
+        x_offsets = arrays['x_offsets'] + totals['x']
+        seg_offsets = arrays['seg_offsets'] + totals['seg']
+        # channel -> [path, kind, comp, x_start, x_end, seg_start, seg_end, pre_wrap, post_wrap]
+        clips[name] = {
+            'stop_time': stop_time,
+            'settings': settings,
+            'channels': [[path, kind, comp,
+                          int(x_offsets[i]), int(x_offsets[i + 1]),
+                          int(seg_offsets[i]), int(seg_offsets[i + 1]),
+                          *arrays['wraps'][i].tolist()]
+                         for i, (path, kind, comp) in enumerate(header['channels'])],
+        }
+        for key in chunks:
+            chunks[key].append(arrays[key])
+        totals['x'] = int(x_offsets[-1])
+        totals['seg'] = int(seg_offsets[-1])
+
+    data = {key: np.ascontiguousarray(np.concatenate(parts) if parts else np.zeros(0), dtype=_ARRAY_DTYPES[key])
+            for key, parts in chunks.items()}
+    data['coeffs'] = data['coeffs'].reshape(-1, 4)
+
+    # Array offsets are relative to the data section, which starts at the first
+    # aligned byte after the index
+    layout = {}
+    offset = 0
+    for key, array in data.items():
+        layout[key] = {'offset': offset, 'shape': list(array.shape)}
+        offset = _align(offset + array.nbytes)
+    index = {'clips': clips, 'arrays': layout}
+    index_bytes = json.dumps(index).encode('utf-8')
+    data_start = _align(_PREFIX.size + len(index_bytes))
+
+    with open(library_path, 'wb') as f:
+        f.write(_PREFIX.pack(LIBRARY_MAGIC, LIBRARY_VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for key, array in data.items():
+            f.seek(data_start + layout[key]['offset'])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    return index
+
+
+class ClipLibrary:
+    """Read-only, memory-mapped pack of compiled clips.
+
+    Every curve is a view into the shared mapping, so processes opening the
+    same library share one physical copy of the curve data.
+    """
+
+    def __init__(self, library_path: str):
+        self.library_path = library_path
+        with open(library_path, 'rb') as f:
+            magic, version, index_len = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != LIBRARY_MAGIC:
+                raise ValueError(f"Not a clip library: {library_path}")
+            if version != LIBRARY_VERSION:
+                raise ValueError(f"Unsupported clip library version {version}: {library_path}")
+            self.index = json.loads(f.read(index_len).decode('utf-8'))
+        self._map = np.memmap(library_path, dtype=np.uint8, mode='r')
+        data_start = _align(_PREFIX.size + index_len)
+        self.arrays = {}
+        for key, entry in self.index['arrays'].items():
+            dtype = np.dtype(_ARRAY_DTYPES[key])
+            count = int(np.prod(entry['shape']))
+            start = data_start + entry['offset']
+            self.arrays[key] = (self._map[start:start + count * dtype.itemsize]
+                                .view(dtype).reshape(entry['shape']))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index['clips']
+
+    def __len__(self):
+        return len(self.index['clips'])
+
+    def names(self):
+        return list(self.index['clips'])
+
+    def _curve(self, entry) -> CompiledCurve:
+        _, _, _, x0, x1, s0, s1, pre_wrap, post_wrap = entry
+        return CompiledCurve(self.arrays['x'][x0:x1],
+                             self.arrays['coeffs'][s0:s1],
+                             self.arrays['flags'][s0:s1],
+                             pre_wrap, post_wrap)
+
+    def channel(self, name: str, path: str, kind: str, comp: str = '') -> CompiledCurve:
+        """Look up a single curve by clip name, path, curve kind and component"""
+        for entry in self.index['clips'][name]['channels']:
+            if entry[0] == path and entry[1] == kind and entry[2] == comp:
+                return self._curve(entry)
+        raise KeyError((name, path, kind, comp))
+
+    def open_clip(self, name: str):
+        """Return (anim, stop_time, settings) backed by the memory map, like load_clip"""
+        clip = self.index['clips'][name]
+        anim = {}
+        for entry in clip['channels']:
+            path, kind, comp = entry[:3]
+            kinds = anim.setdefault(path, {})
+            if comp:
+                kinds.setdefault(kind, {})[comp] = self._curve(entry)
+            else:
+                kinds[kind] = self._curve(entry)
+        return anim, clip['stop_time'], clip['settings']
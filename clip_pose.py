@@ -0,0 +1,173 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from compiled_curve import CompiledCurve, WRAP_CLAMP, WRAP_PINGPONG, WRAP_CYCLE_OFFSET
+
+# Column order of a pose: kinds in play_frame's output order, components in Unity's
+POSE_KINDS = ('Euler', 'Rotation', 'Position', 'Scale', 'Float')
+_COMPONENT_ORDER = {'x': 0, 'y': 1, 'z': 2, 'w': 3}
+
+
+class PoseLayout:
+    """Stable row/column layout of a clip's pose: one row per path, one column per channel.
+
+    ``paths`` keeps the clip's path order and ``channels`` holds ``(kind, comp)``
+    pairs (comp is the float attribute for 'Float' and '' for scalar kinds).
+    ``animated`` marks which (row, column) slots have a curve; the rest are NaN.
+    """
+
+    def __init__(self, anim: Dict[str, Any]):
+        self.paths: Tuple[str, ...] = tuple(anim)
+        self.rows: Dict[str, int] = {path: i for i, path in enumerate(self.paths)}
+        channels: Dict[str, List[str]] = {}
+        for kinds in anim.values():
+            for kind, comps in kinds.items():
+                names = channels.setdefault(kind, [])
+                for comp in (comps if isinstance(comps, dict) else ('',)):
+                    if comp not in names:
+                        names.append(comp)
+        kinds = [k for k in POSE_KINDS if k in channels] + [k for k in channels if k not in POSE_KINDS]
+        self.channels: Tuple[Tuple[str, str], ...] = tuple(
+            (kind, comp) for kind in kinds
+            for comp in (channels[kind] if kind == 'Float' else
+                         sorted(channels[kind], key=lambda c: _COMPONENT_ORDER.get(c, len(_COMPONENT_ORDER)))))
+        self.columns: Dict[Tuple[str, str], int] = {channel: j for j, channel in enumerate(self.channels)}
+        self.animated = np.zeros(self.shape, dtype=bool)
+        for row, column, _ in self.slots(anim):
+            self.animated[row, column] = True
+
+    def slots(self, anim: Dict[str, Any]) -> List[Tuple[int, int, Any]]:
+        """(row, column, curve) for every curve of anim, e.g. the baked version of the clip"""
+        return [(self.rows[path], self.columns[(kind, comp)], curve)
+                for path, kinds in anim.items()
+                for kind, comps in kinds.items()
+                for comp, curve in (comps.items() if isinstance(comps, dict) else [('', comps)])]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.paths), len(self.channels)
+
+    def index(self, path: str, kind: str, comp: str = '') -> Tuple[int, int]:
+        """(row, column) of one channel"""
+        return self.rows[path], self.columns[(kind, comp)]
+
+    def quaternion_slots(self) -> np.ndarray:
+        """(n, 4) flat slot indices of the x/y/z/w Rotation channels of every path animating all four"""
+        names = ('x', 'y', 'z', 'w')
+        if not all(('Rotation', c) in self.columns for c in names):
+            return np.zeros((0, 4), dtype=np.intp)
+        columns = [self.columns[('Rotation', c)] for c in names]
+        rows = [row for row in range(len(self.paths)) if self.animated[row, columns].all()]
+        return (np.array(rows, dtype=np.intp)[:, None] * len(self.channels) + columns).reshape(-1, 4)
+
+    def unpack(self, pose: np.ndarray, path: str) -> Dict[str, Dict[str, Any]]:
+        """One path of a pose (or of a pose array, last two axes) as {kind: {comp: value}}"""
+        row = self.rows[path]
+        out: Dict[str, Dict[str, Any]] = {}
+        for (kind, comp), column in self.columns.items():
+            if self.animated[row, column]:
+                out.setdefault(kind, {})[comp] = pose[..., row, column]
+        return out
+
+
+class CurveBank:
+    """Evaluate many curves at once in one NumPy pass.
+
+    All CompiledCurves are packed into shared arrays, and each curve's segment
+    starts are shifted onto their own stretch of one sorted axis, so a single
+    searchsorted and one Horner step cover every curve at every time. Other
+    curve types (BakedCurve) are evaluated one by one; falsy curves give 0.
+    """
+
+    def __init__(self, curves: Sequence[Any]):
+        self.size = len(curves)
+        self.other = [(i, c) for i, c in enumerate(curves) if not (isinstance(c, CompiledCurve) and len(c))]
+        packed = [i for i, c in enumerate(curves) if isinstance(c, CompiledCurve) and len(c)]
+        self.packed = np.array(packed, dtype=np.intp)
+        curves = [curves[i] for i in packed]
+
+        self.x0 = np.array([c.x[0] for c in curves], dtype=np.float64)
+        self.x1 = np.array([c.x[-1] for c in curves], dtype=np.float64)
+        self.span = self.x1 - self.x0
+        self.pre = np.array([c.pre_wrap for c in curves], dtype=np.uint8)
+        self.post = np.array([c.post_wrap for c in curves], dtype=np.uint8)
+        self.wraps = bool(any(c.wraps for c in curves))
+        self.delta = np.array([c.cycle_delta() if WRAP_CYCLE_OFFSET in (c.pre_wrap, c.post_wrap) else 0.0
+                               for c in curves], dtype=np.float64)
+
+        # Curve i occupies [base[i], base[i] + span[i]] of the search axis, one unit apart
+        counts = np.array([len(c) for c in curves], dtype=np.intp)
+        self.first = np.zeros(len(curves), dtype=np.intp)
+        self.first[1:] = np.cumsum(counts)[:-1]
+        self.last = self.first + counts - 1
+        self.base = np.zeros(len(curves), dtype=np.float64)
+        self.base[1:] = np.cumsum(self.span + 1.0)[:-1]
+        self.starts = np.concatenate([c.x[:-1] for c in curves]) if curves else np.zeros(0)
+        self.keys = np.concatenate([c.x[:-1] - c.x[0] + b for c, b in zip(curves, self.base)]) if curves else np.zeros(0)
+        coeffs = np.concatenate([c.coeffs for c in curves]) if curves else np.zeros((0, 4))
+        # One contiguous array per power gathers faster than rows of the (n, 4) table
+        self.c0, self.c1, self.c2, self.c3 = (np.ascontiguousarray(coeffs[:, k]) for k in range(4))
+
+    def _wrap(self, t: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Per-curve pre/post infinity for times t (n, 1) or (n, c): (times in each key range (n, c), value offsets)"""
+        # minimum/maximum rather than np.clip: this runs every frame and np.clip's overhead dominates
+        u = np.minimum(np.maximum(t, self.x0), self.x1)
+        if not self.wraps:
+            return u, None
+        offset = np.zeros(u.shape)
+        t = np.broadcast_to(t, u.shape)
+        for modes, side in ((self.pre, t < self.x0), (self.post, t > self.x1)):
+            side = side & (modes != WRAP_CLAMP) & (self.span > 0)
+            if not side.any():
+                continue
+            cols = np.nonzero(side)[1]
+            start, span, mode = self.x0[cols], self.span[cols], modes[cols]
+            cycles = np.floor((t[side] - start) / span)
+            w = t[side] - start - cycles * span
+            w = np.where((mode == WRAP_PINGPONG) & (cycles % 2 == 1), span - w, w)
+            u[side] = np.clip(start + w, start, self.x1[cols])
+            offset[side] = np.where(mode == WRAP_CYCLE_OFFSET, cycles * self.delta[cols], 0.0)
+        return u, offset
+
+    def evaluate(self, times: np.ndarray) -> np.ndarray:
+        """Values (n_times, n_curves) for times (n_times,), or per-curve times (n_times, n_curves)"""
+        times = np.asarray(times, dtype=np.float64)
+        per_curve = times.ndim == 2
+        if not per_curve:
+            times = times.reshape(-1, 1)
+        values = np.empty((len(times), self.size))
+        if len(self.packed):
+            u, offset = self._wrap(times[:, self.packed] if per_curve else times)
+            seg = np.searchsorted(self.keys, u - self.x0 + self.base, side='right') - 1
+            seg = np.minimum(np.maximum(seg, self.first), self.last)
+            # Shifting onto the search axis can round a time just before a key onto it
+            d = u - self.starts[seg]
+            early = (d < 0) & (seg > self.first)
+            if early.any():
+                seg = np.where(early, seg - 1, seg)
+                d = u - self.starts[seg]
+            packed = ((self.c3[seg] * d + self.c2[seg]) * d + self.c1[seg]) * d + self.c0[seg]
+            if offset is not None:
+                packed += offset
+            values[:, self.packed] = packed
+        for i, curve in self.other:
+            values[:, i] = curve.evaluate(times[:, i] if per_curve else times[:, 0]) if curve else 0.0
+        return values
+
+
+class PoseEvaluator:
+    """Evaluate every curve of a clip into its PoseLayout with one CurveBank"""
+
+    def __init__(self, layout: PoseLayout, anim: Dict[str, Any]):
+        self.layout = layout
+        slots = layout.slots(anim)
+        self.bank = CurveBank([curve for _, _, curve in slots])
+        self.flat = np.array([row * layout.shape[1] + column for row, column, _ in slots], dtype=np.intp)
+
+    def evaluate(self, times: np.ndarray) -> np.ndarray:
+        """Pose for each time: (n_times, n_paths, n_channels), NaN where a path lacks a channel"""
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        pose = np.full((len(times),) + self.layout.shape, np.nan)
+        pose.reshape(len(times), -1)[:, self.flat] = self.bank.evaluate(times)
+        return pose
@@ -0,0 +1,350 @@
+import math
+from bisect import bisect_right
+
+import numpy as np
+
+# Segment flags stored alongside the coefficient table
+SEG_HERMITE = 0
+SEG_CONSTANT = 1
+
+# Segments a cursor steps through before it gives up and bisects
+CURSOR_WALK = 2
+
+# What a curve does before its first / after its last key (pre/post infinity)
+WRAP_CLAMP = 0
+WRAP_LOOP = 1
+WRAP_PINGPONG = 2
+WRAP_CYCLE_OFFSET = 3  # loop, shifted by the start-to-end value change every cycle
+
+
+def wrap_time(t, start, end, mode):
+    """Map times outside [start, end] back into it with a WRAP_* mode.
+
+    Returns ``(times, cycles)``; ``cycles`` counts the whole periods removed
+    (negative before start, 0 inside the range). Vectorized over ``t``.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    span = end - start
+    if mode == WRAP_CLAMP or span <= 0:
+        return np.clip(t, start, end), np.zeros(t.shape)
+    inside = (t >= start) & (t <= end)
+    cycles = np.where(inside, 0.0, np.floor((t - start) / span))
+    u = np.where(inside, t - start, t - start - cycles * span)
+    if mode == WRAP_PINGPONG:
+        u = np.where(cycles % 2 == 1, span - u, u)
+    return start + u, cycles
+
+
+def wrap_time_scalar(t, start, end, mode):
+    """Scalar wrap_time for the per-frame paths"""
+    if start <= t <= end:
+        return t, 0
+    span = end - start
+    if mode == WRAP_CLAMP or span <= 0:
+        return (start if t < start else end), 0
+    cycles = math.floor((t - start) / span)
+    u = t - start - cycles * span
+    if mode == WRAP_PINGPONG and cycles % 2:
+        u = span - u
+    return start + u, cycles
+
+
+class CompiledCurve:
+    """Piecewise cubic curve packed into contiguous float64 arrays.
+
+    ``x`` holds the ``n + 1`` breakpoints, ``coeffs`` the ``(n, 4)`` polynomial
+    coefficients ``c0 + c1*d + c2*d**2 + c3*d**3`` (``d`` is the time since the
+    segment start) and ``flags`` marks constant/stepped segments. ``pre_wrap``
+    and ``post_wrap`` (WRAP_*) decide what happens outside the keys.
+    """
+    __slots__ = ('x', 'coeffs', 'flags', 'pre_wrap', 'post_wrap')
+
+    def __init__(self, x, coeffs, flags, pre_wrap=WRAP_CLAMP, post_wrap=WRAP_CLAMP):
+        self.x = np.ascontiguousarray(x, dtype=np.float64)
+        self.coeffs = np.ascontiguousarray(coeffs, dtype=np.float64).reshape(-1, 4)
+        self.flags = np.ascontiguousarray(flags, dtype=np.uint8)
+        self.pre_wrap = int(pre_wrap)
+        self.post_wrap = int(post_wrap)
+
+    def __len__(self):
+        return len(self.flags)
+
+    def __repr__(self):
+        return f"CompiledCurve(segments={len(self)}, x_interval={self.x_interval})"
+
+    @property
+    def x_interval(self):
+        return float(self.x[0]), float(self.x[-1])
+
+    @property
+    def nbytes(self):
+        return self.x.nbytes + self.coeffs.nbytes + self.flags.nbytes
+
+    @property
+    def is_static(self):
+        """True when the whole curve is one constant value"""
+        return len(self.flags) == 1 and bool(self.flags[0] == SEG_CONSTANT)
+
+    def locate(self, t):
+        """Return the segment index for each time in ``t``"""
+        idx = np.searchsorted(self.x[:-1], t, side='right') - 1
+        return np.clip(idx, 0, len(self.flags) - 1)
+
+    @property
+    def wraps(self):
+        """True when either side is not clamped"""
+        return bool(self.pre_wrap or self.post_wrap)
+
+    def cycle_delta(self):
+        """Value change from the first to the last key, added per cycle by WRAP_CYCLE_OFFSET"""
+        start, end = self._evaluate(self.x[[0, -1]])
+        return float(end - start)
+
+    def evaluate(self, t):
+        """Vectorized evaluation; times outside the key range follow pre_wrap/post_wrap"""
+        t = np.asarray(t, dtype=np.float64)
+        if not self.wraps or self.is_static:
+            return self._evaluate(t)
+        x0, xn = self.x[0], self.x[-1]
+        u = t.copy()
+        offset = np.zeros(t.shape)
+        for mode, side in ((self.pre_wrap, t < x0), (self.post_wrap, t > xn)):
+            if mode != WRAP_CLAMP and side.any():
+                u[side], cycles = wrap_time(t[side], x0, xn, mode)
+                if mode == WRAP_CYCLE_OFFSET:
+                    offset[side] = cycles * self.cycle_delta()
+        return self._evaluate(u) + offset
+
+    def _evaluate(self, t):
+        """Evaluation with times outside the key range clamped"""
+        if self.is_static:
+            return np.full(t.shape, self.coeffs[0, 0])
+        idx = self.locate(t)
+        if self.flags.all():
+            # Step table: every segment is constant, no polynomial to evaluate
+            return self.coeffs[idx, 0]
+        d = np.clip(t, self.x[0], self.x[-1]) - self.x[idx]
+        c = self.coeffs[idx]
+        return ((c[..., 3] * d + c[..., 2]) * d + c[..., 1]) * d + c[..., 0]
+
+    def __call__(self, t):
+        if not isinstance(t, (int, float)):
+            value = self.evaluate(t)
+            return float(value) if value.ndim == 0 else value
+        # Scalar fast path: one searchsorted and a plain float Horner, no temporary arrays
+        if self.is_static:
+            return float(self.coeffs[0, 0])
+        x = self.x
+        if self.wraps and not x[0] <= t <= x[-1]:
+            mode = self.pre_wrap if t < x[0] else self.post_wrap
+            u, cycles = wrap_time_scalar(t, float(x[0]), float(x[-1]), mode)
+            offset = cycles * self.cycle_delta() if mode == WRAP_CYCLE_OFFSET else 0.0
+            return self(u) + offset
+        last = len(self.flags) - 1
+        i = int(x.searchsorted(t, 'right')) - 1
+        i = 0 if i < 0 else (last if i > last else i)
+        d = min(max(t, float(x[0])), float(x[-1])) - float(x[i])
+        c0, c1, c2, c3 = self.coeffs[i].tolist()
+        return ((c3 * d + c2) * d + c1) * d + c0
+
+    def scalar_evaluator(self):
+        """Return a plain-Python t -> value function over list copies of this curve's tables"""
+        if self.is_static:
+            value = float(self.coeffs[0, 0])
+            return lambda t: value
+        xs = self.x.tolist()
+        coeffs = self.coeffs.tolist()
+        starts = xs[:-1]
+        x0, xn, last = xs[0], xs[-1], len(coeffs) - 1
+
+        def evaluate(t):
+            i = bisect_right(starts, t) - 1
+            i = 0 if i < 0 else (last if i > last else i)
+            d = min(max(t, x0), xn) - xs[i]
+            c0, c1, c2, c3 = coeffs[i]
+            return ((c3 * d + c2) * d + c1) * d + c0
+        return self._wrap_evaluator(evaluate)
+
+    def cursor_evaluator(self):
+        """Like scalar_evaluator, but remembers the segment of the previous call.
+
+        When time moves monotonically in small steps (normal playback) the next
+        segment is found by walking from the last one, so lookups are amortized
+        O(1); seeks and large jumps fall back to bisection.
+        """
+        if self.is_static:
+            value = float(self.coeffs[0, 0])
+            return lambda t: value
+        xs = self.x.tolist()
+        coeffs = self.coeffs.tolist()
+        starts = xs[:-1]
+        x0, xn, last = xs[0], xs[-1], len(coeffs) - 1
+        # Half-open [lower, upper) range of every segment; times outside the keys clamp to the ends
+        lower = [float('-inf')] + xs[1:last + 1]
+        upper = xs[1:last + 1] + [float('inf')]
+        # The current segment is kept unpacked so the common case is two comparisons and a Horner
+        i = 0
+        lo, hi, xi = lower[0], upper[0], xs[0]
+        c0, c1, c2, c3 = coeffs[0]
+
+        def evaluate(t):
+            nonlocal i, lo, hi, xi, c0, c1, c2, c3
+            if not lo <= t < hi:
+                step = 1 if t >= hi else -1
+                j = i + step
+                for _ in range(CURSOR_WALK):
+                    if lower[j] <= t < upper[j]:
+                        break
+                    j += step
+                else:
+                    j = bisect_right(starts, t) - 1
+                    j = 0 if j < 0 else (last if j > last else j)
+                i = j
+                lo, hi, xi = lower[j], upper[j], xs[j]
+                c0, c1, c2, c3 = coeffs[j]
+            d = (x0 if t < x0 else (xn if t > xn else t)) - xi
+            return ((c3 * d + c2) * d + c1) * d + c0
+        return self._wrap_evaluator(evaluate)
+
+    def _wrap_evaluator(self, evaluate):
+        """Put pre/post wrapping in front of a clamping scalar evaluator (a no-op for clamped curves)"""
+        if not self.wraps:
+            return evaluate
+        x0, xn = float(self.x[0]), float(self.x[-1])
+        pre, post = self.pre_wrap, self.post_wrap
+        delta = self.cycle_delta()
+
+        def wrapped(t):
+            if x0 <= t <= xn:
+                return evaluate(t)
+            mode = pre if t < x0 else post
+            u, cycles = wrap_time_scalar(t, x0, xn, mode)
+            return evaluate(u) + cycles * delta if mode == WRAP_CYCLE_OFFSET else evaluate(u)
+        return wrapped
+
+
+def compile_hermite(x, y, out_slopes, in_slopes):
+    """Build a CompiledCurve from key times, values and (already weighted) slopes.
+
+    Segment ``k`` uses ``out_slopes[k]`` and ``in_slopes[k + 1]``. An infinite
+    slope turns the segment into a constant (stepped) one, as Unity does.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) < 2:
+        # A single key is a constant curve
+        value = y[0] if len(y) else 0.0
+        start = x[0] if len(x) else 0.0
+        return CompiledCurve([start, start], [[value, 0.0, 0.0, 0.0]], [SEG_CONSTANT])
+
+    m0 = np.asarray(out_slopes, dtype=np.float64)[:-1]
+    m1 = np.asarray(in_slopes, dtype=np.float64)[1:]
+    y0, y1 = y[:-1], y[1:]
+    h = np.diff(x)
+
+    # outSlope[k] takes precedence over inSlope[k + 1]; +inf holds y0, -inf jumps to y1
+    inf0 = np.isinf(m0)
+    inf1 = np.isinf(m1)
+    const_value = np.where(inf0, np.where(m0 > 0, y0, y1), np.where(m1 > 0, y0, y1))
+    # Zero-width intervals (duplicate key times) become an instant jump
+    zero_width = h <= 0
+    const_value = np.where(zero_width & ~(inf0 | inf1), y1, const_value)
+    constant = inf0 | inf1 | zero_width
+
+    coeffs = np.zeros((len(h), 4), dtype=np.float64)
+    hermite = ~constant
+    hh = h[hermite]
+    dy = (y1[hermite] - y0[hermite]) / hh
+    s0 = m0[hermite]
+    s1 = m1[hermite]
+    coeffs[hermite, 0] = y0[hermite]
+    coeffs[hermite, 1] = s0
+    coeffs[hermite, 2] = (3.0 * dy - 2.0 * s0 - s1) / hh
+    coeffs[hermite, 3] = (s0 + s1 - 2.0 * dy) / (hh * hh)
+    coeffs[constant, 0] = const_value[constant]
+
+    flags = np.where(constant, SEG_CONSTANT, SEG_HERMITE).astype(np.uint8)
+    return CompiledCurve(x, coeffs, flags)
+
+
+def simplify_curve(curve: CompiledCurve) -> CompiledCurve:
+    """Fold flat Hermite segments into constants and merge runs of equal constants.
+
+    A channel that never changes collapses to a single constant segment (see
+    ``is_static``) and a stepped one to a step table. The result evaluates
+    exactly like the input; the input is returned as-is when nothing changes.
+    """
+    coeffs = curve.coeffs.copy()
+    flags = curve.flags.copy()
+    # Equal values and zero slopes at both ends leave only c0
+    flat = (flags == SEG_HERMITE) & ~coeffs[:, 1:].any(axis=1)
+    flags[flat] = SEG_CONSTANT
+
+    constant = flags == SEG_CONSTANT
+    absorbed = constant[1:] & constant[:-1] & (coeffs[1:, 0] == coeffs[:-1, 0])
+    if not flat.any() and not absorbed.any():
+        return curve
+    keep = np.concatenate([[True], ~absorbed])
+    x = np.append(curve.x[:-1][keep], curve.x[-1])
+    return CompiledCurve(x, coeffs[keep], flags[keep], curve.pre_wrap, curve.post_wrap)
+
+
+class BakedCurve:
+    """Curve pre-sampled at a fixed rate into a float32 lookup table.
+
+    Shares the CompiledCurve call interface, so a player can swap one for the other.
+    """
+    __slots__ = ('table', 'start', 'rate', 'interpolate')
+
+    def __init__(self, table, start, rate, interpolate=True):
+        self.table = table
+        self.start = float(start)
+        self.rate = float(rate)
+        self.interpolate = interpolate
+
+    def __len__(self):
+        return len(self.table)
+
+    def __repr__(self):
+        return f"BakedCurve(samples={len(self)}, rate={self.rate})"
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def evaluate(self, t):
+        u = np.clip((np.asarray(t, dtype=np.float64) - self.start) * self.rate, 0, len(self.table) - 1)
+        if not self.interpolate or len(self.table) < 2:
+            return self.table[np.floor(u + 0.5).astype(np.intp)].astype(np.float64)
+        i = np.minimum(u.astype(np.intp), len(self.table) - 2)
+        a = self.table[i].astype(np.float64)
+        return a + (self.table[i + 1] - a) * (u - i)
+
+    def __call__(self, t):
+        if np.ndim(t):
+            return self.evaluate(t)
+        # Scalar fast path: plain float arithmetic beats NumPy dispatch here
+        last = len(self.table) - 1
+        u = min(max((t - self.start) * self.rate, 0.0), last)
+        if not self.interpolate or last == 0:
+            return float(self.table[int(u + 0.5)])
+        i = min(int(u), last - 1)
+        a = float(self.table[i])
+        return a + (float(self.table[i + 1]) - a) * (u - i)
+
+    def scalar_evaluator(self):
+        """Return a plain-Python t -> value function over a list copy of the table"""
+        table = self.table.tolist()
+        start, rate, last, interpolate = self.start, self.rate, len(table) - 1, self.interpolate
+
+        def evaluate(t):
+            u = min(max((t - start) * rate, 0.0), last)
+            if not interpolate or last == 0:
+                return table[int(u + 0.5)]
+            i = min(int(u), last - 1)
+            a = table[i]
+            return a + (table[i + 1] - a) * (u - i)
+        return evaluate
+
+    # Table lookup is already O(1); nothing to remember between calls
+    cursor_evaluator = scalar_evaluator
@@ -0,0 +1,158 @@
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Unity's CompressedAnimationCurve: key times are delta-encoded in hundredths of a second
+TIME_UNIT = 0.01
+# A packed quaternion: 3 flag bits, then the three smallest components in 9 + 10 + 10 bits
+QUAT_BITS = 32
+
+
+# ===== Bit streams: Unity packs values LSB first, across byte boundaries =====
+def _hex_bytes(data: Any, n_bytes: int) -> np.ndarray:
+    """m_Data as bytes; Unity writes byte arrays as hex, which a YAML loader may have read as a number"""
+    if data is None:
+        text = ''
+    elif isinstance(data, bool) or not isinstance(data, (str, int)):
+        raise TypeError(f"m_Data must be hex text, got {type(data).__name__} {data!r}; "
+                        f"it was resolved by a YAML loader that does not keep it raw (clear_yaml_cache may help)")
+    elif isinstance(data, int):
+        # An all-digit hex string read as a decimal number; its leading zeros are restored
+        text = f"{data:0{2 * n_bytes}d}"
+    else:
+        text = data
+    try:
+        raw = np.frombuffer(bytes.fromhex(text), dtype=np.uint8)
+    except ValueError:
+        raise ValueError(f"m_Data is not hex text: {text!r}") from None
+    if len(raw) < n_bytes:
+        raise ValueError(f"m_Data holds {len(raw)} bytes, expected at least {n_bytes}")
+    return raw
+
+
+def _read_bits(bits: np.ndarray, starts: np.ndarray, size: int) -> np.ndarray:
+    """Unsigned size-bit fields starting at each bit offset"""
+    if size == 0:
+        return np.zeros(len(starts), dtype=np.int64)
+    fields = bits[starts[:, None] + np.arange(size)].astype(np.int64)
+    return (fields << np.arange(size, dtype=np.int64)).sum(axis=1)
+
+
+def _bit_stream(vector: Dict[str, Any], n_bits: int) -> np.ndarray:
+    raw = _hex_bytes(vector.get('m_Data'), (n_bits + 7) // 8)
+    return np.unpackbits(raw, bitorder='little')
+
+
+def unpack_ints(vector: Dict[str, Any]) -> np.ndarray:
+    """PackedIntVector -> int64 array"""
+    n, bit_size = int(vector.get('m_NumItems') or 0), int(vector.get('m_BitSize') or 0)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    bits = _bit_stream(vector, n * bit_size)
+    return _read_bits(bits, np.arange(n) * bit_size, bit_size)
+
+
+def unpack_floats(vector: Dict[str, Any]) -> np.ndarray:
+    """PackedFloatVector -> float64 array, quantized over [m_Start, m_Start + m_Range]"""
+    n, bit_size = int(vector.get('m_NumItems') or 0), int(vector.get('m_BitSize') or 0)
+    start, value_range = float(vector.get('m_Start') or 0), float(vector.get('m_Range') or 0)
+    if n == 0:
+        return np.zeros(0)
+    if bit_size == 0:
+        return np.full(n, start)
+    bits = _bit_stream(vector, n * bit_size)
+    return _read_bits(bits, np.arange(n) * bit_size, bit_size) * (value_range / ((1 << bit_size) - 1)) + start
+
+
+def unpack_quats(vector: Dict[str, Any]) -> np.ndarray:
+    """PackedQuatVector -> (n, 4) unit quaternions in x, y, z, w order.
+
+    Each quaternion keeps its three smallest components; the flags hold the index
+    of the dropped one (rebuilt from the unit length) and its sign.
+    """
+    n = int(vector.get('m_NumItems') or 0)
+    if n == 0:
+        return np.zeros((0, 4))
+    bits = _bit_stream(vector, n * QUAT_BITS)
+    base = np.arange(n) * QUAT_BITS
+    flags = _read_bits(bits, base, 3)
+    dropped = flags & 3
+    q = np.zeros((n, 4))
+    pos = base + 3
+    for j in range(4):
+        stored = dropped != j
+        # The component right after the dropped one gets 9 bits, the other two 10
+        short = (dropped + 1) % 4 == j
+        for size, members in ((9, stored & short), (10, stored & ~short)):
+            if members.any():
+                q[members, j] = _read_bits(bits, pos[members], size) / (0.5 * ((1 << size) - 1)) - 1.0
+                pos[members] += size
+    rows = np.arange(n)
+    q[rows, dropped] = np.sqrt(np.maximum(1.0 - np.einsum('ij,ij->i', q, q), 0.0))
+    q[rows, dropped] *= np.where(flags & 4, -1.0, 1.0)
+    return q
+
+
+def decode_compressed_rotation(curve: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """One m_CompressedRotationCurves entry -> (times, (n, 4) quaternions, in_slopes, out_slopes).
+
+    Slopes are (n, 4) when m_Slopes holds 8 floats per key (in x/y/z/w, then out
+    x/y/z/w) and None otherwise.
+    """
+    times = np.cumsum(unpack_ints(curve.get('m_Times') or {})) * TIME_UNIT
+    quats = unpack_quats(curve.get('m_Values') or {})
+    if len(quats) != len(times):
+        raise ValueError(f"Compressed rotation has {len(times)} times but {len(quats)} values")
+    slopes = unpack_floats(curve.get('m_Slopes') or {})
+    if len(times) and len(slopes) == 8 * len(times):
+        slopes = slopes.reshape(-1, 2, 4)
+        return times, quats, slopes[:, 0], slopes[:, 1]
+    return times, quats, None, None
+
+
+# ===== Packing, for writing test clips =====
+def _hex(bits: np.ndarray) -> str:
+    return np.packbits(bits.astype(np.uint8), bitorder='little').tobytes().hex()
+
+
+def _field_bits(values: np.ndarray, size: int) -> np.ndarray:
+    return ((np.asarray(values, dtype=np.int64)[:, None] >> np.arange(size)) & 1).reshape(-1)
+
+
+def pack_ints(values: np.ndarray) -> Dict[str, Any]:
+    values = np.asarray(values, dtype=np.int64)
+    bit_size = max(int(values.max()).bit_length(), 1) if len(values) else 0
+    return {'m_NumItems': len(values), 'm_Data': _hex(_field_bits(values, bit_size)), 'm_BitSize': bit_size}
+
+
+def pack_floats(values: np.ndarray, bit_size: int = 24) -> Dict[str, Any]:
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return {'m_NumItems': 0, 'm_Range': 0, 'm_Start': 0, 'm_Data': '', 'm_BitSize': 0}
+    start, value_range = float(values.min()), float(values.max() - values.min())
+    top = (1 << bit_size) - 1
+    x = np.round((values - start) / value_range * top) if value_range > 0 else np.zeros(len(values))
+    return {'m_NumItems': len(values), 'm_Range': value_range, 'm_Start': start,
+            'm_Data': _hex(_field_bits(x, bit_size)), 'm_BitSize': bit_size}
+
+
+def pack_quats(quats: np.ndarray) -> Dict[str, Any]:
+    """(n, 4) unit quaternions -> PackedQuatVector, dropping the largest component of each"""
+    quats = np.asarray(quats, dtype=np.float64)
+    n = len(quats)
+    dropped = np.argmax(np.abs(quats), axis=1)
+    rows = np.arange(n)
+    flags = dropped | np.where(quats[rows, dropped] < 0, 4, 0)
+    bits = np.zeros((n, QUAT_BITS), dtype=np.uint8)
+    bits[:, :3] = _field_bits(flags, 3).reshape(n, 3)
+    pos = np.full(n, 3)
+    for j in range(4):
+        for size, members in ((9, (dropped != j) & ((dropped + 1) % 4 == j)),
+                              (10, (dropped != j) & ((dropped + 1) % 4 != j))):
+            if members.any():
+                x = np.round((quats[members, j] + 1.0) * 0.5 * ((1 << size) - 1))
+                field = _field_bits(x, size).reshape(-1, size)
+                for k, (row, p) in enumerate(zip(np.nonzero(members)[0], pos[members])):
+                    bits[row, p:p + size] = field[k]
+                pos[members] += size
+    return {'m_NumItems': n, 'm_Data': _hex(bits.reshape(-1))}
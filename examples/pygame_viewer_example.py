@@ -2,7 +2,7 @@ import os
 import pygame
 from pygame.locals import *
 
-from animation_player import AnimationPlayer
+from animation_player import AnimationPlayer, preload_directory
 
 # --- Configuration ---
 ANIM_FOLDER = "examples/AnimationClip"  # Change to your animation folder path
@@ -48,6 +48,12 @@ class AnimationTest:
         
         if not anim_names:
             print(f"No .anim files found in {ANIM_FOLDER}")
+        else:
+            # Compile every clip up front so the first playback doesn't stutter; in-process,
+            # since worker processes would be forked from (or re-import) the running window
+            for report in preload_directory(ANIM_FOLDER, workers=1):
+                if not report['ok']:
+                    print(f"Failed to preload {report['path']}:\n{report['error']}")
         
         return anim_names
 
@@ -378,5 +384,6 @@ class AnimationTest:
         pygame.quit()
 
 # Run program
-app = AnimationTest()
-app.run()
\ No newline at end of file
+if __name__ == '__main__':
+    app = AnimationTest()
+    app.run()
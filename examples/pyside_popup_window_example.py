@@ -31,6 +31,10 @@ class PopupWindow(QWidget):
     def anim_signal_received(self, dic):
         position = dic.get('position', (0, 0))
         self.move(int(self.position0[0] + position[0]), int(self.position0[1] - position[1]))
+        # Popup_System fades the popup in through m_FloatCurves
+        alpha = dic.get('float', {}).get('mColor.a')
+        if alpha is not None:
+            self.setWindowOpacity(alpha)
 
 
 
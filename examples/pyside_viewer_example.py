@@ -10,6 +10,7 @@ from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QPixmap, QPainter, QTransform
 
 from pyside_animation_player import PysideAnimationPlayer
+from animation_player import preload_directory
 
 
 class AnimationDisplayWidget(QLabel):
@@ -200,6 +201,11 @@ class AnimationTestWindow(QMainWindow):
         self.file_combo.clear()
         
         if self.animation_files:
+            # Compile every clip up front so the first playback doesn't stutter; in-process,
+            # since worker processes would be forked from (or re-import) the running QApplication
+            for report in preload_directory(self.anim_folder, workers=1):
+                if not report['ok']:
+                    print(f"Failed to preload {report['path']}:\n{report['error']}")
             self.file_combo.addItems([os.path.splitext(f)[0] for f in self.animation_files])
             print(f"Found {len(self.animation_files)} animation files")
         else:
@@ -306,4 +312,5 @@ def main():
     sys.exit(app.exec())
 
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
\ No newline at end of file
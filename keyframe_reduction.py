@@ -0,0 +1,165 @@
+import sys
+from typing import Dict, Any, Tuple, Union
+
+import numpy as np
+
+from compiled_curve import CompiledCurve, SEG_HERMITE, simplify_curve
+from cache_yaml import _get_file_sha256, _get_file_stat
+from clip_cache import save_compiled_clip
+
+# Samples per original segment used to measure the deviation of a reduced curve
+CHECK_SAMPLES = 16
+
+
+def _check_times(curve: CompiledCurve) -> np.ndarray:
+    """Breakpoints plus CHECK_SAMPLES evenly spaced times inside every segment"""
+    x = curve.x
+    frac = np.arange(1, CHECK_SAMPLES) / CHECK_SAMPLES
+    inner = (x[:-1, None] + np.diff(x)[:, None] * frac).ravel()
+    return np.sort(np.concatenate([x, inner]))
+
+
+def _segment_end(coeffs: np.ndarray, h: float) -> Tuple[float, float]:
+    """Value and slope of one polynomial segment at its far end"""
+    c0, c1, c2, c3 = coeffs
+    return ((c3 * h + c2) * h + c1) * h + c0, (3.0 * c3 * h + 2.0 * c2) * h + c1
+
+
+def _hermite_coeffs(y0: float, m0: float, y1: float, m1: float, h: float) -> np.ndarray:
+    dy = (y1 - y0) / h
+    return np.array([y0, m0, (3.0 * dy - 2.0 * m0 - m1) / h, (m0 + m1 - 2.0 * dy) / (h * h)])
+
+
+def reduce_curve(curve: CompiledCurve, max_error: float) -> CompiledCurve:
+    """Drop interior keys while the curve stays within max_error of the original.
+
+    Runs of consecutive Hermite segments are greedily replaced by one Hermite
+    segment that keeps the run's end values and outer slopes. Constant (stepped)
+    segments are kept as they are.
+    """
+    x, coeffs, flags = curve.x, curve.coeffs, curve.flags
+    n = len(flags)
+    new_x = [float(x[0])]
+    new_coeffs = []
+    new_flags = []
+    i = 0
+    while i < n:
+        if flags[i] != SEG_HERMITE:
+            new_x.append(float(x[i + 1]))
+            new_coeffs.append(coeffs[i])
+            new_flags.append(flags[i])
+            i += 1
+            continue
+        # Extend the run [i, j] one segment at a time while the merged segment fits
+        best_j, best = i, coeffs[i]
+        j = i + 1
+        while j < n and flags[j] == SEG_HERMITE:
+            h = x[j + 1] - x[i]
+            y1, m1 = _segment_end(coeffs[j], x[j + 1] - x[j])
+            merged = _hermite_coeffs(coeffs[i, 0], coeffs[i, 1], y1, m1, h)
+            times = np.concatenate([np.linspace(x[i], x[j + 1], (j - i + 1) * CHECK_SAMPLES + 1), x[i + 1:j + 1]])
+            d = times - x[i]
+            approx = ((merged[3] * d + merged[2]) * d + merged[1]) * d + merged[0]
+            if np.max(np.abs(approx - curve.evaluate(times))) > max_error:
+                break
+            best_j, best = j, merged
+            j += 1
+        new_x.append(float(x[best_j + 1]))
+        new_coeffs.append(best)
+        new_flags.append(SEG_HERMITE)
+        i = best_j + 1
+    if len(new_flags) == n:
+        return curve
+    return CompiledCurve(new_x, new_coeffs, new_flags, curve.pre_wrap, curve.post_wrap)
+
+
+def max_deviation(original: CompiledCurve, reduced: CompiledCurve) -> float:
+    """Largest abs difference between two curves, checked densely over the original's segments"""
+    times = _check_times(original)
+    return float(np.max(np.abs(reduced.evaluate(times) - original.evaluate(times))))
+
+
+def _channel_error(max_error: Union[float, Dict[Any, float]], path: str, kind: str, comp: str):
+    """Resolve the tolerance for one channel: a float, or a dict keyed by (path, kind, comp) or kind"""
+    if not isinstance(max_error, dict):
+        return max_error
+    return max_error.get((path, kind, comp), max_error.get(kind))
+
+
+def reduce_clip(anim: Dict[str, Any], max_error: Union[float, Dict[Any, float]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return (reduced_anim, report) for a parsed clip; the input is left untouched.
+
+    max_error is one tolerance for every channel, or a dict keyed by
+    (path, kind, comp) or by kind ('Position', 'Scale', 'Euler', ...);
+    channels without a tolerance are kept as they are. The report lists
+    every channel with its segment counts and measured max deviation.
+    """
+    reduced: Dict[str, Any] = {}
+    channels = []
+    for path, kinds in anim.items():
+        reduced[path] = {}
+        for kind, comps in kinds.items():
+            items = comps.items() if isinstance(comps, dict) else [('', comps)]
+            out = {}
+            for comp, curve in items:
+                tolerance = _channel_error(max_error, path, kind, comp)
+                if isinstance(curve, CompiledCurve) and tolerance is not None:
+                    new_curve = simplify_curve(reduce_curve(curve, tolerance))
+                    deviation = max_deviation(curve, new_curve)
+                else:
+                    new_curve, deviation = curve, 0.0
+                out[comp] = new_curve
+                if isinstance(curve, CompiledCurve):
+                    channels.append({'path': path, 'kind': kind, 'comp': comp,
+                                     'segments_before': len(curve), 'segments_after': len(new_curve),
+                                     'max_error': tolerance, 'max_deviation': deviation})
+            reduced[path][kind] = out if isinstance(comps, dict) else out['']
+
+    report = {
+        'segments_before': sum(c['segments_before'] for c in channels),
+        'segments_after': sum(c['segments_after'] for c in channels),
+        'max_deviation': max((c['max_deviation'] for c in channels), default=0.0),
+        'channels': channels,
+    }
+    return reduced, report
+
+
+def reduce_anim_file(path: str, max_error: Union[float, Dict[Any, float]], write_cache: bool = True):
+    """Reduce an .anim file's compiled clip; returns ((anim, stop_time, settings), report).
+
+    With write_cache the reduced clip replaces the compiled cache entry (and the
+    in-memory one), so later load_clip / AnimationPlayer calls play the reduced
+    version until the source changes or clear_yaml_cache(path) is called.
+    """
+    from animation_player import load_clip, _remember_clip
+
+    if write_cache:
+        # Signed before loading, like a freshly compiled clip
+        source_stat, source_sha256 = _get_file_stat(path), _get_file_sha256(path)
+    anim, stop_time, settings = load_clip(path)
+    reduced, report = reduce_clip(anim, max_error)
+    clip = (reduced, stop_time, settings)
+    if write_cache:
+        save_compiled_clip(path, reduced, stop_time, settings, source_sha256, source_stat)
+        _remember_clip(path, clip)
+    return clip, report
+
+
+def main(argv=None):
+    """Usage: python keyframe_reduction.py FILE.anim MAX_ERROR [--dry-run]"""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print(main.__doc__)
+        return 1
+    path, max_error = argv[0], float(argv[1])
+    _, report = reduce_anim_file(path, max_error, write_cache='--dry-run' not in argv)
+    print(f"{'path':<24}{'channel':<16}{'segments':>14}{'max deviation':>16}")
+    for c in report['channels']:
+        channel = f"{c['kind']}.{c['comp']}" if c['comp'] else c['kind']
+        print(f"{c['path']:<24}{channel:<16}{c['segments_before']:>6} -> {c['segments_after']:<4}{c['max_deviation']:>16.6g}")
+    print(f"{'total':<40}{report['segments_before']:>6} -> {report['segments_after']:<4}{report['max_deviation']:>16.6g}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
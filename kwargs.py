@@ -1,15 +1,20 @@
-from typing import Tuple, Literal, Union, TypedDict
+from functools import lru_cache
+from typing import Tuple, Literal, Union, TypedDict, Optional
 from dataclasses import dataclass, asdict
 from dacite import from_dict
 
+from quaternion import ROTATION_FORMATS
+
 class PlayKwargsDict(TypedDict, total=False):
     path: str
     timeReverse: bool
     Eunit: Union[Literal['x', 'y', 'z'], Tuple[Literal['x', 'y', 'z'], ...]]
     Runit: Union[Literal['x', 'y', 'z', 'w'], Tuple[Literal['x', 'y', 'z', 'w'], ...]]
+    Rformat: Literal['components', 'quaternion', 'euler', 'angle']
     Punit: Union[Literal['x', 'y', 'z', 'w'], Tuple[Literal['x', 'y', 'z', 'w'], ...]]
     Preverse: Union[bool, Tuple[bool, ...]]
     Pratio: Union[float, Tuple[float, ...]]
+    Funit: Optional[Union[str, Tuple[str, ...]]]
 
 
 @dataclass
@@ -22,18 +27,60 @@ class PlayKwargs:
     Preverse and Pratio behavior:
     - If single value, apply to all coordinates
     - If tuple, apply sequentially to corresponding coordinates
+    Rformat 'components' returns the rotation components picked by Runit; 'quaternion' the normalized
+    (x, y, z, w), 'euler' Unity's (x, y, z) angles and 'angle' the 2D (z) angle, in degrees.
+    Funit picks m_FloatCurves attributes (e.g. 'mColor.a'); None returns every attribute of the path as a dict.
     """
     path: str = 'general'
     timeReverse: bool = False
     Eunit: Union[Literal['x', 'y', 'z'], Tuple[Literal['x', 'y', 'z'], ...]] = 'z'
     Runit: Union[Literal['x', 'y', 'z', 'w'], Tuple[Literal['x', 'y', 'z', 'w'], ...]] = 'w'
+    Rformat: Literal['components', 'quaternion', 'euler', 'angle'] = 'components'
     Punit: Union[Literal['x', 'y', 'z', 'w'], Tuple[Literal['x', 'y', 'z', 'w'], ...]] = ('x', 'y')
     Preverse: Union[bool, Tuple[bool, ...]] = False
     Pratio: Union[float, Tuple[float, ...]] = 1.0
+    Funit: Optional[Union[str, Tuple[str, ...]]] = None
 
 
-def type_kwargs(**kwargs) -> PlayKwargsDict:
+def _typed(value):
+    """Cache key for a kwarg value that tells 1, 1.0 and True apart, inside tuples too"""
+    if isinstance(value, tuple):
+        return tuple, tuple(_typed(v) for v in value)
+    return type(value), value
+
+
+def _untyped(key):
+    kind, value = key
+    return tuple(_untyped(v) for v in value) if kind is tuple else value
+
+
+@lru_cache(maxsize=256, typed=True)
+def _checked_kwargs(items: Tuple) -> PlayKwargsDict:
+    return _check_kwargs({key: _untyped(value) for key, value in items})
 
+
+def _check_kwargs(kwargs) -> PlayKwargsDict:
     default_kwargs = PlayKwargs()
     merged_kwargs = {**asdict(default_kwargs), **kwargs}
-    return asdict(from_dict(PlayKwargs, merged_kwargs))
\ No newline at end of file
+    merged_kwargs['path'] = str(merged_kwargs['path'])
+    merged_kwargs['timeReverse'] = bool(merged_kwargs['timeReverse'])
+    if merged_kwargs['Rformat'] not in ROTATION_FORMATS:
+        raise ValueError(f"Unknown Rformat '{merged_kwargs['Rformat']}', expected one of {ROTATION_FORMATS}")
+    return asdict(from_dict(PlayKwargs, merged_kwargs))
+
+
+def type_kwargs(**kwargs) -> PlayKwargsDict:
+    """Validate play kwargs against PlayKwargs and fill in the defaults.
+
+    Every play entry point goes through here; results are cached per distinct set of
+    kwargs, since dacite is far too slow to run on every frame.
+    """
+    # Lists are accepted wherever a tuple is
+    kwargs = {key: tuple(value) if isinstance(value, list) else value for key, value in kwargs.items()}
+    try:
+        items = tuple(sorted((key, _typed(value)) for key, value in kwargs.items()))
+        hash(items)
+    except TypeError:
+        # Unhashable values are invalid anyway; let dacite report them
+        return _check_kwargs(kwargs)
+    return dict(_checked_kwargs(items))
\ No newline at end of file
@@ -1,154 +1,74 @@
-from scipy.interpolate import CubicHermiteSpline, interp1d
 import numpy as np
 
-# ===== New: Unified interpolation segment class =====
-class MixedSegment:
-    def __init__(self, x_start, x_end, interpolator):
-        self.x = np.array([x_start, x_end], dtype=float)
-        self.x_interval = (x_start, x_end)
-        self._interp = interpolator  # Callable object
-    
-    def __call__(self, x):
-        return self._interp(x)
-    
-    def covers(self, x):
-        a, b = self.x_interval
-        return (x >= a) & (x <= b)
-
-# ===== Modified piecewise_hermite function =====
-def piecewise_hermite(x_points, y_points, in_slopes, out_slopes, in_weights, out_weights, tangentMode, weightedMode):
+from compiled_curve import CompiledCurve, compile_hermite, WRAP_CLAMP, WRAP_LOOP, WRAP_PINGPONG
+from compressed_rotation import decode_compressed_rotation
+from unity_yaml import AnimCurveStream, TRANSFORM_CURVE_BLOCKS, FLOAT_CURVE_BLOCK, COMPRESSED_ROTATION_BLOCK, CURVE_BLOCKS
+
+
+# ===== Parse slopes: convert 'Infinity' / '-Infinity' to np.inf / -np.inf =====
+def _parse_slope(s):
+    if s == 'Infinity':
+        return np.inf
+    elif s == '-Infinity':
+        return -np.inf
+    else:
+        return float(s)
+
+
+def _parse_slopes(slopes):
+    if isinstance(slopes, np.ndarray):
+        # Streamed columns are already float (float('Infinity') is inf)
+        return np.array(slopes, dtype=float)
+    return np.array([_parse_slope(s) for s in slopes], dtype=float)
+
+
+# ===== piecewise_hermite: compile keyframes into a packed coefficient table =====
+def piecewise_hermite(x_points, y_points, in_slopes, out_slopes, in_weights, out_weights, tangentMode, weightedMode) -> CompiledCurve:
     x_points = np.array(x_points, dtype=float)
     y_points = np.array(y_points, dtype=float)
-    n = len(x_points)
-    if n < 2:
-        return []
-
-    # === Parse slopes: convert 'Infinity' / '-Infinity' to np.inf / -np.inf ===
-    def parse_slope(s):
-        if s == 'Infinity':
-            return np.inf
-        elif s == '-Infinity':
-            return -np.inf
-        else:
-            return float(s)
 
-    in_sl_raw = np.array([parse_slope(s) for s in in_slopes])
-    out_sl_raw = np.array([parse_slope(s) for s in out_slopes])
+    in_sl = _parse_slopes(in_slopes)
+    out_sl = _parse_slopes(out_slopes)
 
     # === Weighted processing (different handling based on weightedMode values) ===
-    weightedMode = np.array(weightedMode, dtype=float)
+    # 0: no weights, 1: in_sl weighted, 2: both weighted, 3: out_sl weighted  # NOT ACCURATE
+    # If weightedMode value is not 0-3, do no processing, keep original values
+    weightedMode = np.array(weightedMode, dtype=float).astype(int)
     in_weights = np.array(in_weights, dtype=float)
     out_weights = np.array(out_weights, dtype=float)
+    known = (weightedMode >= 0) & (weightedMode <= 3)
 
-    # Convert to float array (inf will remain as np.inf)
-    in_sl = np.array(in_sl_raw, dtype=float)
-    out_sl = np.array(out_sl_raw, dtype=float)
-
-    # Process each point according to its weightedMode value
-    for i in range(len(weightedMode)):
-        mode = int(weightedMode[i])
-        # Create finite value mask
-        finite_in = np.isfinite(in_sl[i])
-        finite_out = np.isfinite(out_sl[i])
-        
-        if mode == 0:  # Neither in_sl nor out_sl multiplied by weights
-            # Only clip finite values, don't multiply by weights
-            if finite_in:
-                in_sl[i] = np.clip(in_sl[i], -1e8, 1e8)
-            if finite_out:
-                out_sl[i] = np.clip(out_sl[i], -1e8, 1e8)
-        elif mode == 1:  # in_sl multiplied, out_sl not multiplied
-            if finite_in:
-                in_sl[i] = np.clip(in_sl[i] * in_weights[i], -1e8, 1e8)  # NOT ACCURATE
-            if finite_out:
-                out_sl[i] = np.clip(out_sl[i], -1e8, 1e8)
-        elif mode == 2:  # Both in_sl and out_sl multiplied
-            if finite_in:
-                in_sl[i] = np.clip(in_sl[i] * in_weights[i], -1e8, 1e8)  # NOT ACCURATE
-            if finite_out:
-                out_sl[i] = np.clip(out_sl[i] * out_weights[i], -1e8, 1e8)  # NOT ACCURATE
-        elif mode == 3:  # in_sl not multiplied, out_sl multiplied
-            if finite_in:
-                in_sl[i] = np.clip(in_sl[i], -1e8, 1e8)
-            if finite_out:
-                out_sl[i] = np.clip(out_sl[i] * out_weights[i], -1e8, 1e8)  # NOT ACCURATE
-        # If weightedMode value is not 0-3, do no processing, keep original values
-
-    tangentMode = np.array(tangentMode, dtype=float)
-
-    segments = []
-
-    # === Segment by tangentMode != 1 (breakpoints) ===
-    break_indices = np.where(tangentMode != 1.0)[0]
-    indices = [0] + list(break_indices) + [n - 1]
-    indices = sorted(set(indices))
-
-    for seg_start_idx in range(len(indices) - 1):
-        i0 = indices[seg_start_idx]
-        i1 = indices[seg_start_idx + 1]  # Continuous segment: [i0, i1] (inclusive)
-
-        if i1 <= i0:
-            continue
-
-        # Extract sub-segment data
-        sub_x = x_points[i0:i1+1]
-        sub_y = y_points[i0:i1+1]
-        sub_in = in_sl[i0:i1+1]
-        sub_out = out_sl[i0:i1+1]
-
-        num_intervals = len(sub_x) - 1
-        if num_intervals <= 0:
-            continue
-
-        # === Preprocess whether each segment [k, k+1] is constant ===
-        for k in range(num_intervals):
-            x0, x1 = sub_x[k], sub_x[k+1]
-            y0, y1 = sub_y[k], sub_y[k+1]
-            out_slope_k = sub_out[k]      # Controls [x_k, x_{k+1}]
-            in_slope_k1 = sub_in[k+1]     # Also controls [x_k, x_{k+1}]
-
-            use_constant = False
-            const_value = None
-
-            # 🔥 Prioritize checking if outSlope[k] and inSlope[k+1] are inf
-            if np.isinf(out_slope_k):
-                use_constant = True
-                const_value = y0 if out_slope_k == np.inf else y1
-            elif np.isinf(in_slope_k1):
-                use_constant = True
-                const_value = y0 if in_slope_k1 == np.inf else y1
-            if use_constant:
-                # Create constant interpolation function (vectorization safe)
-                interpolator = lambda x, val=const_value: np.full_like(x, val, dtype=float)
-            else:
-                # Reserve interface based on tangentMode: future different processing methods can be added based on tangentMode values
-                if tangentMode[i] == 0 or tangentMode[i] == 1:
-                    # Can add special handling for tangentMode == 0 or 1 here in the future
-                    pass  # Currently no special handling, maintain generic logic
-                
-                # Directly use original slope values, no longer calculate averages
-                slope0 = sub_out[k]  # Directly use out_slope as starting slope
-                slope1 = sub_in[k+1]  # Directly use in_slope as ending slope
-
-                # 🔒 Safety fallback: if slopes still contain inf (shouldn't happen theoretically), convert to constant
-                if not (np.isfinite(slope0) and np.isfinite(slope1)):
-                    interpolator = lambda x, val=y0: np.full_like(x, val, dtype=float)
-                else:
-                    try:
-                        hermite = CubicHermiteSpline([x0, x1], [y0, y1], [slope0, slope1])
-                        interpolator = hermite
-                    except Exception:
-                        # fallback to linear
-                        interpolator = interp1d([x0, x1], [y0, y1], kind='linear', fill_value="extrapolate")
-
-            segments.append(MixedSegment(x0, x1, interpolator))
-
-    return segments
-
-
-# ===== Modified _parse_m_Curve: adapt to new return type =====
-def _parse_m_Curve(m_Curve_list):
-    """Parse an m_Curve block and perform interpolation processing"""
+    finite_in = np.isfinite(in_sl) & known
+    weight_in = finite_in & ((weightedMode == 1) | (weightedMode == 2))
+    in_sl = np.multiply(in_sl, in_weights, out=in_sl.copy(), where=weight_in)
+    in_sl = np.where(finite_in, np.clip(in_sl, -1e8, 1e8), in_sl)
+
+    finite_out = np.isfinite(out_sl) & known
+    weight_out = finite_out & ((weightedMode == 2) | (weightedMode == 3))
+    out_sl = np.multiply(out_sl, out_weights, out=out_sl.copy(), where=weight_out)
+    out_sl = np.where(finite_out, np.clip(out_sl, -1e8, 1e8), out_sl)
+
+    # tangentMode only matters through the slopes Unity already baked into the keys
+    return compile_hermite(x_points, y_points, out_sl, in_sl)
+
+
+# Unity's serialized m_PreInfinity / m_PostInfinity (InternalWrapMode); 3 is "default", i.e. clamp
+UNITY_INFINITY_WRAP = {0: WRAP_PINGPONG, 1: WRAP_LOOP, 2: WRAP_CLAMP, 3: WRAP_CLAMP}
+
+
+def _apply_infinity(interpolation, curve_meta):
+    """Set pre/post wrapping from a curve's m_PreInfinity / m_PostInfinity on its compiled curves"""
+    pre = UNITY_INFINITY_WRAP.get(curve_meta.get("m_PreInfinity"), WRAP_CLAMP)
+    post = UNITY_INFINITY_WRAP.get(curve_meta.get("m_PostInfinity"), WRAP_CLAMP)
+    curves = interpolation.values() if isinstance(interpolation, dict) else [interpolation]
+    for curve in curves:
+        curve.pre_wrap, curve.post_wrap = pre, post
+    return interpolation
+
+
+# ===== _parse_m_Curve: keyframe list -> per-field columns -> compiled curves =====
+def _m_Curve_columns(m_Curve_list):
+    """Transpose an m_Curve keyframe list into field -> values (or field -> {comp: values})"""
     parameter_keys = list(m_Curve_list[0].keys())
     parameter_keys.remove("serializedVersion")
     parameter_dict = {}
@@ -160,8 +80,15 @@ def _parse_m_Curve(m_Curve_list):
             }
         else:
             parameter_dict[key] = tuple(curve[key] for curve in m_Curve_list)
+    return parameter_dict
+
 
-    max_time = max(parameter_dict["time"])
+def _compile_columns(parameter_dict, curve_meta=None):
+    """Perform interpolation processing on transposed keyframe columns.
+
+    curve_meta holds the curve's other fields (m_PreInfinity, m_PostInfinity, ...).
+    """
+    max_time = float(np.max(parameter_dict["time"]))
 
     if isinstance(parameter_dict["value"], dict):
         interpolation_list = {}
@@ -190,41 +117,179 @@ def _parse_m_Curve(m_Curve_list):
         )
         interpolation_list = piecewise_hermite(*args)
 
-    return interpolation_list, max_time
+    return _apply_infinity(interpolation_list, curve_meta or {}), max_time
 
 
-# ===== Keep other functions unchanged =====
-def _parse_curve(m_XCurves):
+def _parse_m_Curve(curve):
+    """Parse a curve (its m_Curve keyframes and infinity settings) and perform interpolation processing"""
+    return _compile_columns(_m_Curve_columns(curve["m_Curve"]), curve)
+
+
+def _collect_paths(parsed_curves):
+    """Key (path, interpolation, max_time) items by path name; unnamed paths become 'general', 'general(1)', ..."""
     output = {}
     general_times = 0
     max_times = []
-    for m_XCurve in m_XCurves:
-        path = m_XCurve["path"]
+    for path, parse_output, max_time in parsed_curves:
         if path is None:
             path = 'general' if general_times == 0 else f"general({general_times})"
             general_times += 1
         else:
             path = str(path)
-        parse_output, max_time = _parse_m_Curve(m_XCurve["curve"]["m_Curve"])
         output[path] = parse_output
         max_times.append(max_time)
     max_time_ = max(max_times) if max_times else 0
     return output, max_time_
 
 
-def parse_anim(anim_dict):
-    anim_dict = anim_dict["AnimationClip"]
+def _parse_curve(m_XCurves):
+    return _collect_paths((m_XCurve["path"], *_parse_m_Curve(m_XCurve["curve"]))
+                          for m_XCurve in m_XCurves)
+
+
+def _parse_compressed_rotation(m_CompressedCurve):
+    """Decode one m_CompressedRotationCurves entry straight into x/y/z/w compiled curves.
+
+    Without stored slopes the keys are joined linearly. Returns None for an empty entry.
+    """
+    times, quats, in_slopes, out_slopes = decode_compressed_rotation(m_CompressedCurve)
+    if not len(times):
+        return None
+    if out_slopes is None:
+        dt = np.diff(times)[:, None]
+        secant = np.divide(np.diff(quats, axis=0), dt, out=np.zeros((len(dt), 4)), where=dt > 0)
+        out_slopes = np.vstack([secant, np.zeros((1, 4))])
+        in_slopes = np.vstack([np.zeros((1, 4)), secant])
+    interpolation = {comp: compile_hermite(times, quats[:, k], out_slopes[:, k], in_slopes[:, k])
+                     for k, comp in enumerate('xyzw')}
+    return _apply_infinity(interpolation, m_CompressedCurve), float(times[-1])
+
+
+def _parse_compressed_curve(m_CompressedCurves):
+    parsed = ((m_CompressedCurve.get("m_Path"), _parse_compressed_rotation(m_CompressedCurve))
+              for m_CompressedCurve in m_CompressedCurves)
+    return _collect_paths((path, *decoded) for path, decoded in parsed if decoded is not None)
+
+
+def _float_bindings(m_FloatCurves):
+    """(path, attribute, classID) of every float curve, with the attribute name it is stored under.
+
+    Unnamed paths are the root object, 'general'. An attribute animated on two
+    components of one object keeps its name for the first and gets '#classID' after it.
+    """
+    bindings = []
+    seen = set()
+    for m_FloatCurve in m_FloatCurves:
+        path = m_FloatCurve.get("path")
+        path = 'general' if path is None else str(path)
+        attribute = str(m_FloatCurve.get("attribute"))
+        class_id = int(m_FloatCurve.get("classID") or 0)
+        if (path, attribute) in seen:
+            attribute = f"{attribute}#{class_id}"
+        seen.add((path, attribute))
+        bindings.append({'path': path, 'attribute': attribute, 'classID': class_id})
+    return bindings
+
+
+def _collect_float_curves(bindings, parsed_curves):
+    """Key (interpolation, max_time) items by path, then attribute"""
+    output = {}
+    max_times = []
+    for binding, (interpolation, max_time) in zip(bindings, parsed_curves):
+        output.setdefault(binding['path'], {})[binding['attribute']] = interpolation
+        max_times.append(max_time)
+    return output, max(max_times) if max_times else 0
+
+
+def _parse_float_curves(m_FloatCurves):
+    return _collect_float_curves(_float_bindings(m_FloatCurves),
+                                 (_parse_m_Curve(m_FloatCurve["curve"]) for m_FloatCurve in m_FloatCurves))
+
+
+def _assemble_anim(anim_dict, parsed_blocks):
+    """Merge {m_XCurves: (path -> interpolation, max_time)} into path -> kind -> interpolation"""
     stop_time = anim_dict["m_AnimationClipSettings"]["m_StopTime"]
-    m_XCurveses = ("m_RotationCurves", "m_CompressedRotationCurves", "m_EulerCurves", "m_PositionCurves", "m_ScaleCurves")
     paths = {}
-    for m_XCurves in m_XCurveses:
-        m_XCurves_list = anim_dict[m_XCurves]
-        if m_XCurves_list:
-            m_XCurves_dict, max_time = _parse_curve(m_XCurves_list)
+    for m_XCurves in CURVE_BLOCKS:
+        if m_XCurves in parsed_blocks:
+            m_XCurves_dict, max_time = parsed_blocks[m_XCurves]
             for path_key, m_Curve_interpolation in m_XCurves_dict.items():
                 if path_key not in paths:
                     paths[path_key] = {}
-                paths[path_key][m_XCurves[2:-6]] = m_Curve_interpolation
+                # Decoded compressed rotations are ordinary x/y/z/w Rotation curves
+                kind = 'Rotation' if m_XCurves == COMPRESSED_ROTATION_BLOCK else m_XCurves[2:-6]
+                paths[path_key][kind] = m_Curve_interpolation
             if stop_time == 1 and type(stop_time) == int:
                 stop_time = max_time
-    return paths, stop_time
\ No newline at end of file
+    return paths, stop_time
+
+
+def parse_anim(anim_dict):
+    anim_dict = anim_dict["AnimationClip"]
+    parsed_blocks = {m_XCurves: _parse_compressed_curve(anim_dict[m_XCurves]) if m_XCurves == COMPRESSED_ROTATION_BLOCK
+                     else _parse_curve(anim_dict[m_XCurves])
+                     for m_XCurves in TRANSFORM_CURVE_BLOCKS if anim_dict[m_XCurves]}
+    if anim_dict.get(FLOAT_CURVE_BLOCK):
+        parsed_blocks[FLOAT_CURVE_BLOCK] = _parse_float_curves(anim_dict[FLOAT_CURVE_BLOCK])
+    return _assemble_anim(anim_dict, parsed_blocks)
+
+
+def parse_anim_stream(path):
+    """Parse an .anim file line by line into (paths, stop_time, settings).
+
+    Keyframes go straight into arrays and each curve is compiled as soon as it has
+    been read, so peak memory follows the compiled output rather than the document.
+    Raises UnityYAMLError when the file needs the full loader.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = AnimCurveStream(f)
+        streamed = {}
+        float_metas = []
+        for block, meta, columns in stream:
+            if block == COMPRESSED_ROTATION_BLOCK:
+                decoded = _parse_compressed_rotation(meta)
+                if decoded is not None:
+                    streamed.setdefault(block, []).append((meta.get("m_Path"), *decoded))
+            elif block == FLOAT_CURVE_BLOCK:
+                float_metas.append(meta)
+                streamed.setdefault(block, []).append(_compile_columns(columns, meta))
+            else:
+                streamed.setdefault(block, []).append((meta.get("path"), *_compile_columns(columns, meta)))
+    anim_json = stream.document()
+    bindings = _float_bindings(float_metas)
+    parsed_blocks = {block: _collect_float_curves(bindings, items) if block == FLOAT_CURVE_BLOCK else _collect_paths(items)
+                     for block, items in streamed.items()}
+    paths, stop_time = _assemble_anim(anim_json["AnimationClip"], parsed_blocks)
+    settings = parse_clip_settings(anim_json)
+    # The streamed block is left out of the document
+    settings['float_bindings'] = bindings
+    return paths, stop_time, settings
+
+
+def _parse_events(m_Events):
+    """AnimationEvents as plain dicts sorted by time (stable for events sharing a time)"""
+    events = []
+    for event in m_Events or []:
+        events.append({
+            'time': float(event.get("time") or 0),
+            'functionName': event.get("functionName") or '',
+            'data': '' if event.get("data") is None else str(event.get("data")),
+            'floatParameter': float(event.get("floatParameter") or 0),
+            'intParameter': int(event.get("intParameter") or 0),
+            'messageOptions': int(event.get("messageOptions") or 0),
+        })
+    return sorted(events, key=lambda e: e['time'])
+
+
+def parse_clip_settings(anim_dict):
+    """Collect clip-level settings that are not part of any curve"""
+    anim_dict = anim_dict["AnimationClip"]
+    clip_settings = anim_dict.get("m_AnimationClipSettings") or {}
+    return {
+        'sample_rate': float(anim_dict.get("m_SampleRate") or 60),
+        # Unity WrapMode: 0 default, 1 once, 2 loop, 4 ping-pong, 8 clamp forever
+        'wrap_mode': int(anim_dict.get("m_WrapMode") or 0),
+        'loop_time': bool(clip_settings.get("m_LoopTime") or 0),
+        'events': _parse_events(anim_dict.get("m_Events")),
+        'float_bindings': _float_bindings(anim_dict.get(FLOAT_CURVE_BLOCK) or []),
+    }
@@ -1,46 +1,192 @@
-from typing import Any, Dict, Tuple, Union
-from PySide6.QtCore import QTimer, Signal
+from typing import Any, Dict, List, Optional, Tuple, Union
+from PySide6.QtCore import QObject, QTimer, Signal
 from animation_player import AnimationPlayer
 
 from kwargs import type_kwargs
 
+# Players sharing a clip and options are evaluated with one sample_instances call
+# once a tick has at least this many of them
+CLOCK_BATCH_MIN = 4
+
+
+class AnimationClock(QObject):
+    """One QTimer driving every registered PysideAnimationPlayer.
+
+    Each tick advances and evaluates all running players (players of the same clip
+    in one batch), emits each player's own signal, then ``frame`` once with
+    {player: result} for the whole tick. Players that finish or are paused drop out,
+    and the timer stops when none are left.
+    """
+    frame = Signal(object)  # {player: result}
+
+    def __init__(self, interval: float = 1/60, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.interval = interval
+        self.players: List['PysideAnimationPlayer'] = []
+        self.timer = QTimer(self)
+        self.timer.setInterval(round(interval * 1000))
+        self.timer.timeout.connect(self.tick)
+
+    _shared: Optional['AnimationClock'] = None
+
+    @classmethod
+    def shared(cls) -> 'AnimationClock':
+        """Process-wide clock used by players created with clock=True"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def register(self, player: 'PysideAnimationPlayer'):
+        if player not in self.players:
+            self.players.append(player)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def unregister(self, player: 'PysideAnimationPlayer'):
+        if player in self.players:
+            self.players.remove(player)
+        if not self.players:
+            self.timer.stop()
+
+    def tick(self):
+        groups: Dict[Any, List['PysideAnimationPlayer']] = {}
+        for player in self.players:
+            groups.setdefault(player._batch_key(), []).append(player)
+
+        results = {}
+        for players in groups.values():
+            if len(players) >= CLOCK_BATCH_MIN:
+                frames = self._evaluate_batch(players)
+            else:
+                frames = [player._bound_handle().at(player.t) for player in players]
+            for player, (result, playable) in zip(players, frames):
+                results[player] = player._advance(result, playable)
+
+        for player in [p for p in self.players if not p._running]:
+            self.unregister(player)
+        self.frame.emit(results)
+
+    @staticmethod
+    def _evaluate_batch(players: List['PysideAnimationPlayer']) -> List[Tuple[Dict[str, Any], bool]]:
+        """play_frame results for players that share clip and options, from one vectorized evaluation"""
+        first = players[0]
+        parameters = first.parameters
+        dic, valid = first.sample_instances([p.t for p in players], **parameters)
+        # play_frame returns tuples for tuple units (and scale), plain floats otherwise,
+        # and a dict of every float attribute when Funit is None
+        funit = parameters['Funit']
+        as_tuple = {'euler': isinstance(parameters['Eunit'], tuple),
+                    'rotation': isinstance(parameters['Runit'], tuple) or parameters['Rformat'] in ('quaternion', 'euler'),
+                    'position': isinstance(parameters['Punit'], tuple),
+                    'scale': True, 'float': isinstance(funit, tuple)}
+        attributes = tuple(first.anim[parameters['path']].get('Float', ())) if funit is None else None
+        rows = {key: value.tolist() for key, value in dic.items()}
+        frames = []
+        for i, playable in enumerate(valid.tolist()):
+            if not playable:
+                frames.append(({}, False))
+                continue
+            result = {key: tuple(values[i]) if as_tuple[key] else values[i][0] for key, values in rows.items()}
+            if attributes is not None and 'float' in rows:
+                result['float'] = dict(zip(attributes, rows['float'][i]))
+            frames.append((result, True))
+        return frames
+
+
 class PysideAnimationPlayer(AnimationPlayer):
-    def __init__(self, signal: Signal, file_path: str, stop_time: float = None,
+    def __init__(self, signal: Signal, file_path: str, stop_time: float = None, wrap_mode: str = 'once',
+                 clock: Union[AnimationClock, bool, None] = None,
                  **kwargs: Union[str, bool, Tuple, float]):
-        """All available kwargs are listed in kwargs.py"""
+        """All available kwargs are listed in kwargs.py; wrap_mode is one of animation_player.WRAP_MODES.
+
+        clock=True (or an AnimationClock) drives the player from a shared timer
+        instead of a QTimer of its own.
+        """
         
         self.parameters = type_kwargs(**kwargs)
 
-        super().__init__(file_path, stop_time)
+        super().__init__(file_path, stop_time, wrap_mode)
 
         self.signal = signal
         self.mode = 0  # 0: stop, 1: forward_play, -1: backward_play
         self.t = 0
         self.delta_t = 1/60
-        self.timer = QTimer()
-        self.timer.timeout.connect(self._pyside_play_frame)
+        self.clock = AnimationClock.shared() if clock is True else (clock or None)
+        self.timer = None
+        if self.clock is None:
+            self.timer = QTimer()
+            self.timer.timeout.connect(self._pyside_play_frame)
+        self._running = False  # play() called and not stopped or finished
+        self.event_signal: Optional[Signal] = None  # set to receive the m_Events crossed by each frame
+        self._event_t: Optional[float] = None
+        self._handle = None
+        self._bound_state = None
 
-    def _pyside_play_frame(self):
-        result, self.playable = self.play_frame(self.t, **self.parameters)
-        if self.playable:
-            self.signal.emit(result)
-        else:
-            self.signal.emit(self.return_default(path=self.parameters['path'])[0])
+    def _bound_handle(self):
+        """Reuse the bound handle until the parameters (callers may edit them in place), clip, stop time or wrap mode change"""
+        state = (self.parameters, id(self.anim), self.stop_time, self.wrap_mode)
+        if self._handle is None or self._bound_state != state:
+            self._bound_state = (dict(self.parameters), id(self.anim), self.stop_time, self.wrap_mode)
+            self._handle = self.bind(**self.parameters)
+        return self._handle
+
+    def _batch_key(self):
+        """Players with equal keys can be evaluated together"""
+        return (id(self.anim), self.stop_time, self.wrap_mode, tuple(self.parameters.items()))
+
+    def _advance(self, result: Dict[str, Any], playable: bool) -> Dict[str, Any]:
+        """Emit one evaluated frame and step the time; shared by the own timer and the clock"""
+        self.playable = playable
+        if not playable:
+            result = self.return_default(path=self.parameters['path'])[0]
             self.mode = 0
-            self.timer.stop()
+            self._running = False
+        self.signal.emit(result)
+        if self.event_signal is not None:
+            events = self.events_between(self._event_t, self.t, self.parameters['timeReverse'])
+            self._event_t = self.t
+            if events:
+                self.event_signal.emit(events)
         if self.mode > 0:
             self.t += self.delta_t * self.mode
         elif self.mode < 0:
             self.t += self.delta_t * self.mode
+        elif self.clock is not None:
+            # Paused: the frame can't change until set_time/set_mode, so leave the clock
+            self.clock.unregister(self)
+        return result
+
+    def _pyside_play_frame(self):
+        self._advance(*self._bound_handle().at(self.t))
+        if not self._running:
+            self.timer.stop()
+
     def play(self):
-        self.timer.start(self.delta_t * 1000)
+        self._running = True
+        if self.clock is not None:
+            self.clock.register(self)
+        else:
+            self.timer.start(self.delta_t * 1000)
 
     def stop(self):
-        self.timer.stop()
+        self._running = False
+        if self.clock is not None:
+            self.clock.unregister(self)
+        else:
+            self.timer.stop()
 
     def set_time(self, t: float):
         self.t = t
+        # A seek doesn't fire the events in between
+        self._event_t = None
+        self._wake()
 
     def set_mode(self, mode: int | float):
         self.mode = mode
+        self._wake()
+
+    def _wake(self):
+        # A paused clock-driven player has to show the change
+        if self._running and self.clock is not None:
+            self.clock.register(self)
 
@@ -0,0 +1,118 @@
+import math
+from typing import Any, Tuple
+
+import numpy as np
+
+from clip_pose import CurveBank
+
+# Output formats for m_RotationCurves: raw components picked by Runit (as before),
+# a normalized (x, y, z, w) quaternion, Unity Euler angles or the 2D (z) angle, in degrees
+ROTATION_FORMATS = ('components', 'quaternion', 'euler', 'angle')
+QUATERNION_COMPONENTS = ('x', 'y', 'z', 'w')
+
+
+# ===== Array versions: q is (..., 4) in x, y, z, w order =====
+def normalize_quaternions(q: np.ndarray) -> np.ndarray:
+    """Unit quaternions; zero-length rows become the identity (NaN rows stay NaN)"""
+    q = np.asarray(q, dtype=np.float64)
+    norm = np.sqrt(np.einsum('...i,...i->...', q, q))[..., None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = q / norm
+    out[norm[..., 0] == 0] = (0.0, 0.0, 0.0, 1.0)
+    return out
+
+
+def multiply_quaternions(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Hamilton product a * b (apply b, then a), broadcasting over the leading axes"""
+    ax, ay, az, aw = np.moveaxis(np.asarray(a, dtype=np.float64), -1, 0)
+    bx, by, bz, bw = np.moveaxis(np.asarray(b, dtype=np.float64), -1, 0)
+    return np.stack([aw * bx + ax * bw + ay * bz - az * by,
+                     aw * by - ax * bz + ay * bw + az * bx,
+                     aw * bz + ax * by - ay * bx + az * bw,
+                     aw * bw - ax * bx - ay * by - az * bz], axis=-1)
+
+
+def conjugate_quaternions(q: np.ndarray) -> np.ndarray:
+    return np.asarray(q, dtype=np.float64) * (-1.0, -1.0, -1.0, 1.0)
+
+
+def quaternion_powers(q: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """q ** t for unit quaternions, i.e. slerp from the identity to q by t along the shorter arc"""
+    q = np.asarray(q, dtype=np.float64)
+    q = np.where(q[..., 3:] < 0, -q, q)
+    sin_half = np.sqrt(np.einsum('...i,...i->...', q[..., :3], q[..., :3]))
+    half = np.arctan2(sin_half, q[..., 3])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        axis = np.where((sin_half > 0)[..., None], q[..., :3] / sin_half[..., None], 0.0)
+    scaled = half * np.asarray(t, dtype=np.float64)
+    return np.concatenate([axis * np.sin(scaled)[..., None], np.cos(scaled)[..., None]], axis=-1)
+
+
+def quaternions_to_euler(q: np.ndarray) -> np.ndarray:
+    """Unity Euler angles (..., 3) in degrees, rotation order Z, X, Y; q must be normalized"""
+    x, y, z, w = np.moveaxis(np.asarray(q, dtype=np.float64), -1, 0)
+    ex = np.arcsin(np.clip(2.0 * (w * x - y * z), -1.0, 1.0))
+    ey = np.arctan2(2.0 * (x * z + w * y), 1.0 - 2.0 * (x * x + y * y))
+    ez = np.arctan2(2.0 * (x * y + w * z), 1.0 - 2.0 * (x * x + z * z))
+    return np.degrees(np.stack([ex, ey, ez], axis=-1))
+
+
+def quaternions_to_angle(q: np.ndarray) -> np.ndarray:
+    """Rotation about z in degrees (the Euler z angle), for 2D clips; q must be normalized"""
+    x, y, z, w = np.moveaxis(np.asarray(q, dtype=np.float64), -1, 0)
+    return np.degrees(np.arctan2(2.0 * (x * y + w * z), 1.0 - 2.0 * (x * x + z * z)))
+
+
+def convert_quaternions(q: np.ndarray, rotation_format: str) -> np.ndarray:
+    """Normalize raw (n, 4) quaternions and convert them to rotation_format as (n, k)"""
+    q = normalize_quaternions(q)
+    if rotation_format == 'euler':
+        return quaternions_to_euler(q)
+    if rotation_format == 'angle':
+        return quaternions_to_angle(q)[:, None]
+    if rotation_format not in ('quaternion', 'components'):
+        raise ValueError(f"Unknown rotation format '{rotation_format}', expected one of {ROTATION_FORMATS}")
+    return q
+
+
+# ===== Scalar versions for the per-frame paths =====
+def normalize_quaternion(x: float, y: float, z: float, w: float) -> Tuple[float, float, float, float]:
+    norm = math.sqrt(x * x + y * y + z * z + w * w)
+    if norm == 0:
+        return 0.0, 0.0, 0.0, 1.0
+    return x / norm, y / norm, z / norm, w / norm
+
+
+def convert_quaternion(x: float, y: float, z: float, w: float, rotation_format: str) -> Any:
+    """Scalar convert_quaternions: a 4-tuple, a 3-tuple of Euler angles or one angle"""
+    x, y, z, w = normalize_quaternion(x, y, z, w)
+    angle = math.degrees(math.atan2(2.0 * (x * y + w * z), 1.0 - 2.0 * (x * x + z * z)))
+    if rotation_format == 'angle':
+        return angle
+    if rotation_format == 'euler':
+        return (math.degrees(math.asin(min(max(2.0 * (w * x - y * z), -1.0), 1.0))),
+                math.degrees(math.atan2(2.0 * (x * z + w * y), 1.0 - 2.0 * (x * x + y * y))),
+                angle)
+    if rotation_format not in ('quaternion', 'components'):
+        raise ValueError(f"Unknown rotation format '{rotation_format}', expected one of {ROTATION_FORMATS}")
+    return x, y, z, w
+
+
+class QuaternionTrack:
+    """The x/y/z/w curves of one m_RotationCurves entry, evaluated together.
+
+    Unity interpolates each component on its own and normalizes the result;
+    evaluate() does both for a whole array of times in one NumPy pass.
+    """
+
+    def __init__(self, curves):
+        missing = [c for c in QUATERNION_COMPONENTS if c not in curves]
+        if missing:
+            raise KeyError(f"Rotation curve lacks components {missing}")
+        self.curves = tuple(curves[c] for c in QUATERNION_COMPONENTS)
+        self.bank = CurveBank(self.curves)
+
+    def evaluate(self, times: Any, rotation_format: str = 'quaternion') -> np.ndarray:
+        """(n_times, 4) unit quaternions, (n_times, 3) Euler angles or (n_times, 1) angles"""
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64)).reshape(-1)
+        return convert_quaternions(self.bank.evaluate(times), rotation_format)
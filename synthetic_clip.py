@@ -0,0 +1,163 @@
+import sys
+from typing import Sequence
+
+import numpy as np
+
+from compressed_rotation import TIME_UNIT, pack_floats, pack_ints, pack_quats
+
+# Transform curve blocks the generator can fill, with their components
+CURVE_COMPONENTS = {
+    'm_RotationCurves': 'xyzw',
+    'm_EulerCurves': 'xyz',
+    'm_PositionCurves': 'xyz',
+    'm_ScaleCurves': 'xyz',
+}
+# Bit-packed rotation curves (x, y, z, w), generated instead of m_RotationCurves keyframes
+COMPRESSED_ROTATION_CURVES = 'm_CompressedRotationCurves'
+# Every transform block an AnimationClip lists, in file order
+_CURVE_BLOCKS = ('m_RotationCurves', 'm_CompressedRotationCurves', 'm_EulerCurves',
+                 'm_PositionCurves', 'm_ScaleCurves')
+_DEFAULT_WEIGHT = 0.33333334
+
+
+def _number(v: float) -> str:
+    """Unity's spelling of a float"""
+    if np.isinf(v):
+        return 'Infinity' if v > 0 else '-Infinity'
+    return f"{float(v):.7g}"
+
+
+def _vector(comps: str, values) -> str:
+    return '{' + ', '.join(f"{c}: {_number(v)}" for c, v in zip(comps, values)) + '}'
+
+
+def _packed_lines(name: str, vector: dict) -> list:
+    return [f"    {name}:"] + [f"      {key}: {_number(v) if isinstance(v, float) else v}" for key, v in vector.items()]
+
+
+def _compressed_rotation_lines(path: str, n: int, sample_rate: float, rng, pre_infinity: int, post_infinity: int) -> list:
+    """One m_CompressedRotationCurves entry: a unit-quaternion random walk with its slopes"""
+    # Compressed key times are whole hundredths of a second
+    ticks = np.round(np.arange(n) / sample_rate / TIME_UNIT).astype(np.int64)
+    quats = np.cumsum(rng.normal(scale=0.1, size=(n, 4)), axis=0) + (0.0, 0.0, 0.0, 1.0)
+    quats /= np.linalg.norm(quats, axis=1)[:, None]
+    slopes = np.gradient(quats, ticks * TIME_UNIT, axis=0) if n > 1 else np.zeros((n, 4))
+    lines = [f"  - m_Path: {path}"]
+    lines += _packed_lines('m_Times', pack_ints(np.diff(ticks, prepend=0)))
+    lines += _packed_lines('m_Values', pack_quats(quats))
+    # Per key: in x/y/z/w then out x/y/z/w
+    lines += _packed_lines('m_Slopes', pack_floats(np.hstack([slopes, slopes]).reshape(-1)))
+    return lines + [f"    m_PreInfinity: {pre_infinity}", f"    m_PostInfinity: {post_infinity}"]
+
+
+def generate_clip_text(n_paths: int = 1,
+                       keys_per_curve: int = 60,
+                       curve_types: Sequence[str] = ('m_PositionCurves',),
+                       sample_rate: float = 60,
+                       tangent_modes: Sequence[int] = (0,),
+                       weighted_fraction: float = 0.0,
+                       infinite_fraction: float = 0.0,
+                       pre_infinity: int = 2,
+                       post_infinity: int = 2,
+                       loop_time: bool = False,
+                       seed: int = 0,
+                       name: str = 'synthetic') -> str:
+    """Build the YAML of a Unity AnimationClip with random but valid curves.
+
+    Every path gets one curve per block in curve_types with keys_per_curve keys,
+    one frame (1 / sample_rate) apart. tangentMode is drawn from tangent_modes;
+    weighted_fraction of the keys get weightedMode 1-3 with random weights and
+    infinite_fraction of the slopes become +/-Infinity (stepped segments).
+    m_CompressedRotationCurves are bit-packed unit quaternions with key times
+    rounded to Unity's 0.01 s grid; the tangent and weight options do not apply.
+    With n_paths == 1 the path is left empty, as in clips made on the root object.
+    """
+    supported = list(CURVE_COMPONENTS) + [COMPRESSED_ROTATION_CURVES]
+    unknown = set(curve_types) - set(supported)
+    if unknown:
+        raise ValueError(f"Unsupported curve types {sorted(unknown)}, expected some of {supported}")
+    rng = np.random.default_rng(seed)
+    stop_time = (keys_per_curve - 1) / sample_rate
+    paths = [''] if n_paths == 1 else [f"{name}/{i}" for i in range(n_paths)]
+
+    lines = ["%YAML 1.1", "%TAG !u! tag:unity3d.com,2011:", "--- !u!74 &7400000", "AnimationClip:",
+             "  serializedVersion: 6",
+             "  m_ObjectHideFlags: 0",
+             f"  m_Name: {name}",
+             "  m_Legacy: 1",
+             f"  m_Compressed: {int(COMPRESSED_ROTATION_CURVES in curve_types)}",
+             "  m_UseHighQualityCurve: 1"]
+    for block in _CURVE_BLOCKS:
+        if block not in curve_types:
+            lines.append(f"  {block}: []")
+            continue
+        lines.append(f"  {block}:")
+        if block == COMPRESSED_ROTATION_CURVES:
+            for path in paths:
+                lines += _compressed_rotation_lines(path, keys_per_curve, sample_rate, rng, pre_infinity, post_infinity)
+            continue
+        comps = CURVE_COMPONENTS[block]
+        for path in paths:
+            n, k = keys_per_curve, len(comps)
+            # Random walk values and slopes around the walk's own finite differences
+            values = np.cumsum(rng.normal(size=(n, k)), axis=0)
+            slopes = np.gradient(values, axis=0) * sample_rate + rng.normal(scale=0.1, size=(n, k))
+            in_slopes, out_slopes = slopes.copy(), slopes.copy()
+            for slope in (in_slopes, out_slopes):
+                infinite = rng.random((n, k)) < infinite_fraction
+                slope[infinite] = np.where(rng.random(infinite.sum()) < 0.5, np.inf, -np.inf)
+            weighted = np.where(rng.random(n) < weighted_fraction, rng.integers(1, 4, n), 0)
+            in_weights = np.where(weighted[:, None] > 0, rng.uniform(0.1, 0.9, (n, k)), _DEFAULT_WEIGHT)
+            out_weights = np.where(weighted[:, None] > 0, rng.uniform(0.1, 0.9, (n, k)), _DEFAULT_WEIGHT)
+            modes = rng.choice(tangent_modes, n)
+
+            lines += ["  - curve:", "      serializedVersion: 2", "      m_Curve:"]
+            for i in range(n):
+                lines += ["      - serializedVersion: 3",
+                          f"        time: {_number(i / sample_rate)}",
+                          f"        value: {_vector(comps, values[i])}",
+                          f"        inSlope: {_vector(comps, in_slopes[i])}",
+                          f"        outSlope: {_vector(comps, out_slopes[i])}",
+                          f"        tangentMode: {int(modes[i])}",
+                          f"        weightedMode: {int(weighted[i])}",
+                          f"        inWeight: {_vector(comps, in_weights[i])}",
+                          f"        outWeight: {_vector(comps, out_weights[i])}"]
+            lines += [f"      m_PreInfinity: {pre_infinity}",
+                      f"      m_PostInfinity: {post_infinity}",
+                      "      m_RotationOrder: 4",
+                      f"    path: {path}"]
+    lines += ["  m_FloatCurves: []",
+              "  m_PPtrCurves: []",
+              f"  m_SampleRate: {_number(sample_rate)}",
+              "  m_WrapMode: 0",
+              "  m_ClipBindingConstant:",
+              "    genericBindings: []",
+              "    pptrCurveMapping: []",
+              "  m_AnimationClipSettings:",
+              "    serializedVersion: 2",
+              "    m_StartTime: 0",
+              f"    m_StopTime: {_number(stop_time)}",
+              "    m_CycleOffset: 0",
+              f"    m_LoopTime: {int(loop_time)}",
+              "  m_EditorCurves: []",
+              "  m_EulerEditorCurves: []",
+              "  m_Events: []"]
+    return '\n'.join(lines) + '\n'
+
+
+def write_clip(path: str, **options) -> str:
+    """Write generate_clip_text(**options) to path and return the path"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(generate_clip_text(**options))
+    return path
+
+
+if __name__ == '__main__':
+    # python synthetic_clip.py OUT.anim [KEYS_PER_CURVE] [N_PATHS]
+    if len(sys.argv) < 2:
+        print("Usage: python synthetic_clip.py OUT.anim [KEYS_PER_CURVE] [N_PATHS]")
+        sys.exit(1)
+    keys = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    n_paths = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    write_clip(sys.argv[1], n_paths=n_paths, keys_per_curve=keys,
+               curve_types=tuple(CURVE_COMPONENTS), weighted_fraction=0.1, infinite_fraction=0.02)
@@ -0,0 +1,145 @@
+import math
+import os
+
+import numpy as np
+import pytest
+
+from cache_yaml import load_yaml
+from compressed_rotation import decode_compressed_rotation, unpack_ints, unpack_quats
+from parse_yaml import parse_anim, parse_anim_stream
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'compressed_rotation.anim')
+
+# The fixture's packed data, assembled by hand field by field (it is not a Unity export).
+# m_Times: deltas 0, 3, 5 in 4 bits each, LSB first -> bytes 0x30 0x05, times 0, 0.03, 0.08 s
+TIMES = [0.0, 0.03, 0.08]
+# m_Values: one little-endian 32-bit word per key: 3 flag bits (dropped index, bit 2 = negative),
+# then the stored components in x, y, z, w order; the one after the dropped index has 9 bits
+QUAT_FIELDS = [
+    (3, False, [(300, 9), (600, 10), (400, 10)]),   # w dropped: x 9, y 10, z 10 bits
+    (1, True, [(700, 10), (200, 9), (900, 10)]),    # y dropped and negative: x 10, z 9, w 10 bits
+    (0, False, [(256, 9), (520, 10), (950, 10)]),   # x dropped: y 9, z 10, w 10 bits
+]
+# The second entry's m_Slopes: 24 four-bit fields over m_Start -7.5, m_Range 15, so field k is k - 7.5.
+# The layout (8 floats per key: in x/y/z/w, then out x/y/z/w) is assumed; no Unity export was available.
+SLOPE_FIELDS = [
+    ([1, 2, 3, 4], [5, 6, 7, 8]),
+    ([9, 10, 11, 12], [13, 14, 15, 0]),
+    ([3, 1, 4, 1], [5, 9, 2, 6]),
+]
+
+
+def _expected_quaternion(dropped, negative, fields):
+    q = [0.0] * 4
+    stored = iter(fields)
+    for j in range(4):
+        if j != dropped:
+            value, size = next(stored)
+            q[j] = value / (0.5 * ((1 << size) - 1)) - 1
+    q[dropped] = math.sqrt(1 - sum(c * c for c in q)) * (-1 if negative else 1)
+    return q
+
+
+# ===== Bit-by-bit port of the reference decoder loops (UnityPy / AssetStudio) =====
+def _reference_ints(data, n, bit_size):
+    out, index, bit = [], 0, 0
+    for _ in range(n):
+        value = bits = 0
+        while bits < bit_size:
+            value |= (data[index] >> bit) << bits
+            num = min(bit_size - bits, 8 - bit)
+            bit += num
+            bits += num
+            if bit == 8:
+                index, bit = index + 1, 0
+        out.append(value & ((1 << bit_size) - 1))
+    return out
+
+
+def _reference_quats(data, n):
+    out, index, bit = [], 0, 0
+
+    def read(size):
+        nonlocal index, bit
+        value = bits = 0
+        while bits < size:
+            value |= (data[index] >> bit) << bits
+            num = min(size - bits, 8 - bit)
+            bit += num
+            bits += num
+            if bit == 8:
+                index, bit = index + 1, 0
+        return value & ((1 << size) - 1)
+
+    for _ in range(n):
+        flags = read(3)
+        q = [0.0] * 4
+        total = 0.0
+        for j in range(4):
+            if flags & 3 != j:
+                size = 9 if ((flags & 3) + 1) % 4 == j else 10
+                q[j] = read(size) / (0.5 * ((1 << size) - 1)) - 1
+                total += q[j] * q[j]
+        q[flags & 3] = math.sqrt(max(1 - total, 0.0)) * (-1 if flags & 4 else 1)
+        out.append(q)
+    return out
+
+
+@pytest.fixture(scope='module')
+def entries():
+    return load_yaml(FIXTURE, cache=False)['AnimationClip']['m_CompressedRotationCurves']
+
+
+@pytest.fixture(scope='module')
+def entry(entries):
+    return entries[0]
+
+
+def test_fixture_decodes_to_hand_computed_keys(entry):
+    times, quats, in_slopes, out_slopes = decode_compressed_rotation(entry)
+    np.testing.assert_allclose(times, TIMES, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(quats, [_expected_quaternion(*f) for f in QUAT_FIELDS], rtol=0, atol=1e-12)
+    assert in_slopes is None and out_slopes is None
+
+
+def test_fixture_slopes_decode_to_hand_computed_values(entries):
+    times, quats, in_slopes, out_slopes = decode_compressed_rotation(entries[1])
+    np.testing.assert_allclose(times, TIMES, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(quats, [_expected_quaternion(*f) for f in QUAT_FIELDS], rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(in_slopes, [[k - 7.5 for k in fields] for fields, _ in SLOPE_FIELDS])
+    np.testing.assert_array_equal(out_slopes, [[k - 7.5 for k in fields] for _, fields in SLOPE_FIELDS])
+
+
+def test_digit_only_hex_stays_text(entry):
+    # '3005' would resolve to an int if m_Data were not kept raw
+    assert entry['m_Times']['m_Data'] == '3005'
+
+
+@pytest.mark.parametrize('bit_size', [1, 3, 7, 8, 13, 24])
+def test_unpack_ints_matches_reference_loop(bit_size):
+    rng = np.random.default_rng(bit_size)
+    n = 37
+    data = rng.integers(0, 256, (n * bit_size + 7) // 8, dtype=np.uint8)
+    vector = {'m_NumItems': n, 'm_BitSize': bit_size, 'm_Data': data.tobytes().hex()}
+    assert unpack_ints(vector).tolist() == _reference_ints(data.tolist(), n, bit_size)
+
+
+def test_unpack_quats_matches_reference_loop():
+    rng = np.random.default_rng(0)
+    n = 200
+    data = rng.integers(0, 256, n * 4, dtype=np.uint8)
+    vector = {'m_NumItems': n, 'm_Data': data.tobytes().hex()}
+    np.testing.assert_allclose(unpack_quats(vector), _reference_quats(data.tolist(), n), rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('loader', ['stream', 'full'])
+@pytest.mark.parametrize('compressed_path, keyed_path', [('Compressed', 'Keyed'), ('CompressedSlopes', 'KeyedSlopes')])
+def test_compressed_curve_matches_keyed_rotation(loader, compressed_path, keyed_path):
+    if loader == 'stream':
+        anim, _, _ = parse_anim_stream(FIXTURE)
+    else:
+        anim, _ = parse_anim(load_yaml(FIXTURE, cache=False))
+    compressed, keyed = anim[compressed_path]['Rotation'], anim[keyed_path]['Rotation']
+    times = np.concatenate([np.linspace(-0.2, 0.3, 101), TIMES])
+    for comp in 'xyzw':
+        np.testing.assert_allclose(compressed[comp].evaluate(times), keyed[comp].evaluate(times), rtol=0, atol=1e-12)
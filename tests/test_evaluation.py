@@ -0,0 +1,140 @@
+import os
+import warnings
+
+import numpy as np
+import pytest
+
+from animation_player import AnimationPlayer
+from clip_cache import iter_channels
+from clip_pose import CurveBank
+from compiled_curve import BakedCurve
+from parse_yaml import parse_anim_stream
+from synthetic_clip import CURVE_COMPONENTS, generate_clip_text
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples', 'AnimationClip')
+# Every keyframe curve type, hermite/stepped/weighted keys, a few paths
+CLIP_OPTIONS = dict(n_paths=3, keys_per_curve=24, curve_types=tuple(CURVE_COMPONENTS),
+                    tangent_modes=(0, 1, 5, 136), weighted_fraction=0.2, infinite_fraction=0.1)
+# Unity m_PreInfinity / m_PostInfinity: 0 ping-pong, 1 loop, 2 clamp
+INFINITIES = [(2, 2), (1, 1), (0, 0), (0, 1)]
+WRAP_MODES = ['once', 'clamp', 'loop', 'pingpong']
+PLAY_KWARGS = dict(Eunit=('x', 'y', 'z'), Runit=('x', 'y', 'z', 'w'), Punit=('x', 'y', 'z'))
+# play_frame output -> (pose kind, components)
+OUTPUTS = {'euler': ('Euler', 'xyz'), 'rotation': ('Rotation', 'xyzw'), 'position': ('Position', 'xyz'),
+           'scale': ('Scale', 'xy')}
+
+
+@pytest.fixture(scope='module', params=INFINITIES, ids=lambda p: f'pre{p[0]}-post{p[1]}')
+def clip(request, tmp_path_factory):
+    pre, post = request.param
+    path = tmp_path_factory.mktemp('clips') / f'clip_{pre}_{post}.anim'
+    path.write_text(generate_clip_text(pre_infinity=pre, post_infinity=post, seed=3 * pre + post, **CLIP_OPTIONS))
+    return parse_anim_stream(str(path))
+
+
+def _times(anim, stop_time):
+    """Every key, one float step either side of it, the same a clip length away, and a grid past both ends"""
+    keys = np.unique(np.concatenate([curve.x for *_, curve in iter_channels(anim)] + [[0.0, stop_time]]))
+    around = np.concatenate([keys, np.nextafter(keys, -np.inf), np.nextafter(keys, np.inf)])
+    grid = np.linspace(-1.5 * stop_time, 2.5 * stop_time, 301)
+    return np.concatenate([around, around - stop_time, around + stop_time, grid])
+
+
+def test_curve_bank_matches_each_curve(clip):
+    anim, stop_time, _ = clip
+    curves = [curve for *_, curve in iter_channels(anim)]
+    times = _times(anim, stop_time)
+    bank = CurveBank(curves)
+    values = bank.evaluate(times)
+    # Per-curve times: every column gets its own order
+    rng = np.random.default_rng(0)
+    shuffled = np.stack([rng.permutation(times) for _ in curves], axis=1)
+    per_curve = bank.evaluate(shuffled)
+    for i, curve in enumerate(curves):
+        np.testing.assert_array_equal(values[:, i], curve.evaluate(times))
+        np.testing.assert_array_equal(per_curve[:, i], curve.evaluate(shuffled[:, i]))
+
+
+def test_scalar_evaluators_match_evaluate(clip):
+    anim, stop_time, _ = clip
+    times = _times(anim, stop_time)
+    rng = np.random.default_rng(1)
+    orders = [np.argsort(times), np.argsort(times)[::-1], rng.permutation(len(times))]
+    for *_, curve in iter_channels(anim):
+        expected = curve.evaluate(times)
+        for order in orders:
+            cursor = curve.cursor_evaluator()
+            scalar = curve.scalar_evaluator()
+            np.testing.assert_array_equal([cursor(t) for t in times[order].tolist()], expected[order])
+            np.testing.assert_array_equal([scalar(t) for t in times[order].tolist()], expected[order])
+            np.testing.assert_array_equal([curve(t) for t in times[order].tolist()], expected[order])
+
+
+@pytest.mark.parametrize('wrap_mode', WRAP_MODES)
+def test_pose_matches_each_curve(clip, wrap_mode):
+    anim, stop_time, _ = clip
+    player = AnimationPlayer.from_clip(clip, wrap_mode=wrap_mode)
+    times = _times(anim, stop_time)
+    pose, valid = player.pose(times)
+    clip_times, playable = player._clip_times(times)
+    np.testing.assert_array_equal(valid, playable)
+    for path, kind, comp, curve in iter_channels(anim):
+        row, column = player.pose_layout.index(path, kind, comp)
+        np.testing.assert_array_equal(pose[:, row, column], curve.evaluate(clip_times))
+
+
+@pytest.mark.parametrize('wrap_mode', WRAP_MODES)
+def test_play_frame_sample_and_handles_agree(clip, wrap_mode):
+    anim, stop_time, _ = clip
+    player = AnimationPlayer.from_clip(clip, wrap_mode=wrap_mode)
+    times = _times(anim, stop_time)
+    pose, _ = player.pose(times)
+    for path in anim:
+        sampled, valid = player.sample(times, path=path, **PLAY_KWARGS)
+        # One handle fed the times out of order (seeks), one fed them in order (cursor walks)
+        handles = [(player.bind(path=path, **PLAY_KWARGS), np.arange(len(times))),
+                   (player.bind(path=path, **PLAY_KWARGS), np.argsort(times))]
+        frames = [player.play_frame(t, path=path, **PLAY_KWARGS) for t in times.tolist()]
+        for handle, order in handles:
+            for i in order.tolist():
+                assert handle.at(float(times[i])) == frames[i]
+        for i, (frame, playable) in enumerate(frames):
+            assert playable == valid[i]
+            if not playable:
+                assert frame == {}
+                continue
+            for key, (kind, comps) in OUTPUTS.items():
+                expected = [pose[i, player.pose_layout.rows[path], player.pose_layout.columns[(kind, c)]]
+                            for c in comps]
+                np.testing.assert_array_equal(frame[key], expected)
+                np.testing.assert_array_equal(sampled[key][i], expected)
+
+
+def test_infinite_weighted_slopes_compile_without_warnings():
+    # UIAni_Emo_Sc_Dot has stepped keys: infinite slopes whose weights must not be applied
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        parse_anim_stream(os.path.join(EXAMPLES, 'UIAni_Emo_Sc_Dot.anim'))
+
+
+@pytest.mark.parametrize('multiple', [1, 0.37])
+def test_bake_ends_on_stop_time(clip, multiple):
+    anim, stop_time, settings = clip
+    # An off-grid stop time: a table running past it would pick up the post-infinity wrap
+    player = AnimationPlayer.from_clip(clip, stop_time=stop_time * 0.913)
+    analytic = {(path, kind, comp): curve for path, kind, comp, curve in iter_channels(anim)}
+    player.bake(multiple)
+    for path, kind, comp, baked in iter_channels(player.anim):
+        if not isinstance(baked, BakedCurve):
+            continue
+        expected = analytic[(path, kind, comp)].evaluate(player.stop_time)
+        assert baked.evaluate(player.stop_time) == np.float32(expected)
+        assert baked(player.stop_time) == np.float32(expected)
+
+
+def test_stepped_baked_lookup_rounds_halves_the_same_on_every_path():
+    baked = BakedCurve(np.arange(8, dtype=np.float32), 0.0, 10.0, interpolate=False)
+    halves = (np.arange(7) + 0.5) / 10.0
+    scalar = baked.scalar_evaluator()
+    np.testing.assert_array_equal(baked.evaluate(halves), [baked(t) for t in halves.tolist()])
+    np.testing.assert_array_equal(baked.evaluate(halves), [scalar(t) for t in halves.tolist()])
@@ -0,0 +1,24 @@
+import pytest
+from dacite import DaciteError
+
+from kwargs import type_kwargs
+
+
+@pytest.mark.parametrize('valid, invalid', [
+    (dict(Preverse=True), dict(Preverse=1)),
+    (dict(Preverse=(True, False)), dict(Preverse=(1, False))),
+])
+def test_cached_validation_tells_equal_values_of_other_types_apart(valid, invalid):
+    # True == 1 and they hash alike; a cache hit for one must not let the other skip validation
+    assert type_kwargs(**valid)
+    with pytest.raises(DaciteError):
+        type_kwargs(**invalid)
+
+
+def test_lists_are_accepted_as_tuples():
+    assert type_kwargs(Runit=['x', 'y', 'z', 'w'])['Runit'] == ('x', 'y', 'z', 'w')
+
+
+def test_unknown_rotation_format_is_rejected():
+    with pytest.raises(ValueError, match='Rformat'):
+        type_kwargs(Rformat='matrix')
@@ -0,0 +1,358 @@
+import re
+
+import numpy as np
+
+# Plain-scalar resolution following the YAML 1.1 rules ruamel applies to Unity files.
+# Anything outside this subset raises UnityYAMLError so the caller can fall back to ruamel.
+_INT_RE = re.compile(r'[-+]?(?:0|[1-9][0-9]*)$')
+_FLOAT_RE = re.compile(r'[-+]?(?:[0-9]+\.[0-9]*(?:[eE][-+]?[0-9]+)?|[0-9]+[eE][-+]?[0-9]+)$|\.[0-9]+(?:[eE][-+][0-9]+)?$')
+# Forms ruamel would give a special meaning to (octal/hex/sexagesimal/underscored numbers, .inf/.nan)
+_SPECIAL_RE = re.compile(r'(?:[-+]?(?:0[0-7_]+|0x[0-9a-fA-F_]+|0b[01_]+|[0-9][0-9_]*(?::[0-5]?[0-9])+(?:\.[0-9_]*)?'
+                         r'|[0-9][0-9_.]*_[0-9_.]*(?:[eE][-+]?[0-9]+)?|\.(?:inf|Inf|INF))|\.(?:nan|NaN|NAN))$')
+# Leading indicators for tags, anchors, aliases, block scalars and quoted strings
+_INDICATORS = ('&', '*', '!', '|', '>', '%', '@', '`', '"', "'", '#')
+_NULLS = ('', '~', 'null', 'Null', 'NULL')
+
+
+class UnityYAMLError(ValueError):
+    """The document uses YAML features outside the subset Unity writes"""
+
+
+def _resolve_scalar(text):
+    if text in _NULLS:
+        return None
+    if _INT_RE.match(text):
+        return int(text)
+    if _FLOAT_RE.match(text):
+        return float(text)
+    if text.startswith(_INDICATORS) or _SPECIAL_RE.match(text):
+        raise UnityYAMLError(f"Unsupported scalar: {text!r}")
+    # Booleans stay strings: cache_yaml overrides the YAML bool constructor the same way
+    return text
+
+
+def _split_flow(body):
+    """Split the inside of a flow collection on top-level commas"""
+    items = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(body):
+        if ch in '{[':
+            depth += 1
+        elif ch in '}]':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            items.append(body[start:i].strip())
+            start = i + 1
+    last = body[start:].strip()
+    if last:
+        items.append(last)
+    return items
+
+
+def _parse_inline(text):
+    if text.startswith('{'):
+        if not text.endswith('}'):
+            raise UnityYAMLError(f"Unterminated flow mapping: {text!r}")
+        out = {}
+        for item in _split_flow(text[1:-1]):
+            key, sep, value = item.partition(':')
+            if not sep:
+                raise UnityYAMLError(f"Unsupported flow item: {item!r}")
+            out[key.strip()] = _parse_inline(value.strip())
+        return out
+    if text.startswith('['):
+        if not text.endswith(']'):
+            raise UnityYAMLError(f"Unterminated flow sequence: {text!r}")
+        return [_parse_inline(item) for item in _split_flow(text[1:-1])]
+    return _resolve_scalar(text)
+
+
+def _split_key(content):
+    """Return (key, rest) for a 'key: value' / 'key:' line, or None if it is not a mapping entry"""
+    key, sep, rest = content.partition(': ')
+    if sep:
+        return key, rest.strip()
+    if content.endswith(':'):
+        return content[:-1], ''
+    return None
+
+
+class _Parser:
+    def __init__(self, lines, raw_keys=()):
+        self.lines = lines  # list of [indent, content]
+        self.raw_keys = raw_keys  # keys whose values are kept as text (e.g. hex m_Data)
+        self.i = 0
+
+    def node(self, indent):
+        content = self.lines[self.i][1]
+        if content == '-' or content.startswith('- '):
+            return self.sequence(indent)
+        return self.mapping(indent)
+
+    def mapping(self, indent):
+        out = {}
+        lines = self.lines
+        while self.i < len(lines):
+            line_indent, content = lines[self.i]
+            if line_indent != indent or content == '-' or content.startswith('- '):
+                if line_indent > indent:
+                    raise UnityYAMLError(f"Unexpected indentation at: {content!r}")
+                break
+            entry = _split_key(content)
+            if entry is None:
+                raise UnityYAMLError(f"Expected a mapping entry at: {content!r}")
+            key, rest = entry
+            self.i += 1
+            if rest:
+                out[key] = rest if key in self.raw_keys else _parse_inline(rest)
+            elif self.i < len(lines) and (lines[self.i][0] > indent or
+                                          (lines[self.i][0] == indent and lines[self.i][1][:2] in ('- ', '-'))):
+                # Unity writes block sequences at the same indent as their key
+                out[key] = self.node(lines[self.i][0])
+            else:
+                out[key] = None
+        return out
+
+    def sequence(self, indent):
+        out = []
+        lines = self.lines
+        while self.i < len(lines):
+            line_indent, content = lines[self.i]
+            if line_indent != indent or not (content == '-' or content.startswith('- ')):
+                break
+            rest = content[2:].strip()
+            if not rest:
+                raise UnityYAMLError("Multi-line sequence items are not supported")
+            if rest.startswith('- '):
+                raise UnityYAMLError("Nested inline sequences are not supported")
+            if rest[0] not in '{[' and _split_key(rest) is not None:
+                # '- key: value' opens a mapping indented past the dash
+                lines[self.i] = [indent + 2, rest]
+                out.append(self.mapping(indent + 2))
+            else:
+                self.i += 1
+                out.append(_parse_inline(rest))
+        return out
+
+
+def load_unity_yaml(text):
+    """Parse a single-document Unity YAML file (e.g. an AnimationClip) into plain dicts/lists.
+
+    Produces the same structure as the ruamel loader in cache_yaml, several times faster,
+    except that hex byte arrays (RAW_KEYS) stay text instead of resolving as numbers.
+    Raises UnityYAMLError for anything outside the subset Unity serializes.
+    """
+    lines = []
+    seen_document = False
+    for raw in text.splitlines():
+        stripped = raw.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        if raw.startswith('%'):
+            continue
+        if raw.startswith('---'):
+            if seen_document:
+                raise UnityYAMLError("Multi-document files are not supported")
+            seen_document = True
+            continue
+        if '\t' in raw or ' #' in raw:
+            raise UnityYAMLError(f"Tabs and comments are not supported: {raw!r}")
+        content = raw.lstrip(' ')
+        lines.append([len(raw) - len(content), content.rstrip()])
+    if not lines:
+        return None
+    parser = _Parser(lines, RAW_KEYS)
+    data = parser.node(lines[0][0])
+    if parser.i != len(lines):
+        raise UnityYAMLError(f"Unparsed content at: {lines[parser.i][1]!r}")
+    return data
+
+
+# ===== Streaming curve reader =====
+TRANSFORM_CURVE_BLOCKS = ("m_RotationCurves", "m_CompressedRotationCurves", "m_EulerCurves",
+                          "m_PositionCurves", "m_ScaleCurves")
+# Scalar curves bound to any component property by (path, classID, attribute), e.g. mColor.a
+FLOAT_CURVE_BLOCK = "m_FloatCurves"
+# Bit-packed quaternion curves; their entries are nested mappings rather than keyframe lists
+COMPRESSED_ROTATION_BLOCK = "m_CompressedRotationCurves"
+# Byte arrays Unity writes as hex, which must not be resolved as numbers
+RAW_KEYS = ("m_Data",)
+CURVE_BLOCKS = TRANSFORM_CURVE_BLOCKS + (FLOAT_CURVE_BLOCK,)
+# Curve lists nothing downstream reads; their lines are dropped instead of being kept for the document
+SKIPPED_CURVE_BLOCKS = ("m_EditorCurves", "m_EulerEditorCurves")
+KEYFRAME_FIELDS = ("time", "value", "inSlope", "outSlope", "tangentMode", "weightedMode", "inWeight", "outWeight")
+
+
+class _KeyframeBuffer:
+    """Preallocated per-field keyframe storage that doubles when full"""
+
+    def __init__(self, capacity=16):
+        self.n = 0
+        self.capacity = capacity
+        self.components = {}  # field -> tuple of component names, () for scalar fields
+        self.columns = {}     # field -> (capacity,) or (capacity, n_components) float64 array
+
+    def append(self, fields):
+        if self.n == 0:
+            for name, value in fields.items():
+                comps = tuple(value) if isinstance(value, dict) else ()
+                self.components[name] = comps
+                shape = (self.capacity, len(comps)) if comps else (self.capacity,)
+                self.columns[name] = np.empty(shape, dtype=np.float64)
+        elif self.n == self.capacity:
+            self.capacity *= 2
+            for name, column in self.columns.items():
+                grown = np.empty((self.capacity,) + column.shape[1:], dtype=np.float64)
+                grown[:self.n] = column[:self.n]
+                self.columns[name] = grown
+        if fields.keys() != self.components.keys():
+            raise UnityYAMLError(f"Keyframe fields differ: {sorted(fields)}")
+        for name, value in fields.items():
+            comps = self.components[name]
+            if comps:
+                if not isinstance(value, dict):
+                    raise UnityYAMLError(f"Keyframe field {name} changed shape")
+                self.columns[name][self.n] = [value[c] for c in comps]
+            else:
+                self.columns[name][self.n] = value
+        self.n += 1
+
+    def to_columns(self):
+        """Same layout _parse_m_Curve builds: field -> array, or field -> {comp: array}"""
+        out = {}
+        for name, column in self.columns.items():
+            column = column[:self.n]
+            comps = self.components[name]
+            out[name] = {c: column[:, i] for i, c in enumerate(comps)} if comps else column
+        return out
+
+
+def _parse_number_field(rest):
+    """Keyframe field value: a number or a flat flow mapping of numbers ('Infinity' allowed)"""
+    if rest.startswith('{'):
+        if not rest.endswith('}'):
+            raise UnityYAMLError(f"Unterminated flow mapping: {rest!r}")
+        out = {}
+        for item in rest[1:-1].split(','):
+            key, _, value = item.partition(':')
+            out[key.strip()] = float(value)
+        return out
+    return float(rest)
+
+
+class AnimCurveStream:
+    """Line-by-line reader for AnimationClip YAML that yields curve keyframes as arrays.
+
+    Iterating yields ``(block, meta, columns)`` per curve, where ``meta`` holds the
+    non-keyframe fields (path, m_PreInfinity, attribute, ...) and ``columns`` the
+    keyframe arrays. Compressed rotation entries are yielded whole as
+    ``(block, entry, None)``, with their m_Data kept as hex text. Only the current
+    curve is held in memory; the lines outside the streamed blocks are kept and
+    parsed by document() once iteration is done.
+    """
+
+    def __init__(self, lines, blocks=CURVE_BLOCKS, skip=SKIPPED_CURVE_BLOCKS):
+        self.lines = lines
+        self.blocks = blocks
+        self.skip = skip
+        self._other_lines = []
+        self._done = False
+
+    def document(self):
+        """The rest of the clip parsed with load_unity_yaml; streamed blocks are left out"""
+        if not self._done:
+            raise RuntimeError("document() is only available after the curves have been consumed")
+        return load_unity_yaml('\n'.join(self._other_lines))
+
+    def __iter__(self):
+        block = None          # streamed or skipped block name
+        block_indent = None   # indent of the block's '- ' entries
+        buffer = meta = None
+        keyframe = None       # fields of the keyframe being read
+        key_indent = None     # indent of the keyframe '- ' lines
+        raw_entry = []        # [indent, content] lines of a compressed rotation entry
+
+        def finish_entry():
+            if raw_entry:
+                return block, _Parser(raw_entry, RAW_KEYS).sequence(block_indent)[0], None
+            if keyframe:
+                buffer.append(keyframe)
+            if buffer is not None and buffer.n:
+                return block, meta, buffer.to_columns()
+            return None
+
+        for raw in self.lines:
+            raw = raw.rstrip('\r\n')
+            stripped = raw.strip()
+            if not stripped or stripped.startswith('#'):
+                continue
+            if raw.startswith(('%', '---')):
+                self._other_lines.append(raw)
+                continue
+            content = raw.lstrip(' ')
+            indent = len(raw) - len(content)
+            content = content.rstrip()
+            is_item = content.startswith('- ')
+
+            if block is not None:
+                if block_indent is None and is_item:
+                    block_indent = indent
+                if block_indent is not None and indent >= block_indent and not (indent == block_indent and not is_item):
+                    if block in self.skip:
+                        continue
+                    if block == COMPRESSED_ROTATION_BLOCK:
+                        if indent == block_indent and raw_entry:
+                            yield finish_entry()
+                            raw_entry = []
+                        raw_entry.append([indent, content])
+                        continue
+                    if indent == block_indent:
+                        # New curve entry; '- curve:' carries no data itself
+                        entry = finish_entry()
+                        if entry:
+                            yield entry
+                        buffer, meta, keyframe, key_indent = _KeyframeBuffer(), {}, None, None
+                        content = content[2:]
+                        indent += 2
+                    elif is_item:
+                        # New keyframe: '- serializedVersion: 3'
+                        if keyframe:
+                            buffer.append(keyframe)
+                        keyframe, key_indent = {}, indent
+                        content = content[2:]
+                        indent += 2
+                    entry_kv = _split_key(content)
+                    if entry_kv is None:
+                        raise UnityYAMLError(f"Expected a mapping entry at: {content!r}")
+                    key, rest = entry_kv
+                    if key_indent is not None and indent > key_indent:
+                        if key in KEYFRAME_FIELDS:
+                            keyframe[key] = _parse_number_field(rest)
+                    else:
+                        if keyframe:
+                            buffer.append(keyframe)
+                            keyframe, key_indent = None, None
+                        if key not in ('serializedVersion', 'curve', 'm_Curve'):
+                            meta[key] = _parse_inline(rest) if rest else None
+                    continue
+                # Dedent: the block is over
+                entry = finish_entry()
+                if entry:
+                    yield entry
+                block = block_indent = buffer = meta = keyframe = key_indent = None
+                raw_entry = []
+
+            entry_kv = None if is_item else _split_key(content)
+            if entry_kv and not entry_kv[1] and entry_kv[0] in self.blocks + self.skip:
+                block = entry_kv[0]
+                # Keep an empty list in the document so the key is still present
+                self._other_lines.append(' ' * indent + block + ': []')
+                continue
+            self._other_lines.append(raw)
+
+        if block is not None:
+            entry = finish_entry()
+            if entry:
+                yield entry
+        self._done = True
@@ -11,28 +11,19 @@ from animation_player import AnimationPlayer
 def sample_animation_data(player, selected_path, dt, max_t):
     """Sample animation data at specified path with given time step"""
     times = np.arange(0, max_t + dt, dt)
-    xs, ys = [], []
     
     print(f"  Sampling precision: {dt:.4f}s, Sample points: {len(times)}")
     start_time = time.time()
     
-    for t in times:
-        result, valid = player.play_frame(t, path=selected_path)
-        if valid and 'position' in result:
-            pos = result['position']
-            # Safely convert to float (handles np.float64, array scalars, etc.)
-            x_val = float(pos[0]) if hasattr(pos[0], '__float__') else 0.0
-            y_val = float(pos[1]) if hasattr(pos[1], '__float__') else 0.0
-            xs.append(x_val)
-            ys.append(y_val)
-        else:
-            # If out of range, extend last known value (or zero)
-            xs.append(xs[-1] if xs else 0.0)
-            ys.append(ys[-1] if ys else 0.0)
+    # One vectorized pass; times past stop_time hold the last value
+    result, valid = player.sample(times, path=selected_path, channels=('position',))
+    pos = result.get('position')
+    if pos is not None and pos.shape[1] >= 2:
+        xs, ys = pos[:, 0], pos[:, 1]
+    else:
+        xs = ys = np.zeros(len(times))
     
     computation_time = time.time() - start_time
-    xs = np.array(xs)
-    ys = np.array(ys)
     
     print(f"  Computation time: {computation_time:.3f}s")
     return times, xs, ys, computation_time